@@ -1,65 +1,295 @@
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Type
+from typing import Collection, Iterator, Sequence, Type
+
+import numpy as np
 
 from wordle import loaders, solvers
 from wordle.core import PlaySession, WordleSolver
-from wordle.wordle import Wordle, WordleList
+from wordle.decisiontree import DecisionTree, TreeSolver, compile_tree
+from wordle.patterns import pattern_matrix
+from wordle.wordle import Clue, Wordle, WordleList, compare_many
 
 history_depth = 2
 
 
-def calc_average_score(
+History = dict[tuple[tuple[Wordle, int], ...], tuple[Wordle, float]]
+
+
+def _check_tree(
+    tree: DecisionTree | None,
+    solvertype: Type[WordleSolver],
+    hardmode: bool,
+    firstguess: str | None,
+) -> None:
+    if tree is None:
+        return
+    if tree.solver != solvertype.__name__:
+        raise ValueError(f"Decision tree was compiled for {tree.solver}")
+    if tree.hard != hardmode:
+        mode = "hard" if tree.hard else "easy"
+        raise ValueError(f"Decision tree was compiled for {mode} mode")
+    if firstguess is not None and tree.guess(0) != firstguess:
+        raise ValueError(f"Decision tree starts with {tree.guess(0)}")
+
+
+def _make_solver(
     wordlist: WordleList,
     solvertype: Type[WordleSolver],
+    tree: DecisionTree | None = None,
+) -> WordleSolver:
+    if tree is not None:
+        # The tree already starts with firstguess.
+        return TreeSolver(wordlist, tree)
+    return solvertype(wordlist)
+
+
+def _next_guess(solver: WordleSolver, hardmode: bool) -> tuple[Wordle, float]:
+    if hardmode:
+        return solver.besth(1)[0]
+    return solver.best(1)[0]
+
+
+def opening_history(
+    wordlist: WordleList,
+    solver: WordleSolver,
     hardmode: bool = False,
-    firstguess: str = None,
-) -> tuple[dict[str, dict[str, object]], float, int]:
-    player = PlaySession(wordlist, "hard" if hardmode else "easy")
-    solver = solvertype(wordlist)
+    firstguess: str | None = None,
+) -> History:
+    """The solver's guesses for every clue sequence shorter than history_depth."""
+    history: History = {}
+    solved = 3 ** len(wordlist.words[0]) - 1
     solver.reset()
-    scores: list[int] = []
-    data = {}
-    history: dict[tuple[tuple[Wordle, tuple[int, ...]], ...], tuple[Wordle, float]] = {}
-    if firstguess is not None:
-        history[()] = Wordle(firstguess), 0.0
-    solvewords = tuple(word.word for word in wordlist if word.weight > 0)
-    totalwords = len(solvewords)
-    for iword, word in enumerate(solvewords):
-        data[str(word)] = {
+
+    def visit(curhist: tuple[tuple[Wordle, int], ...]) -> None:
+        if curhist == () and firstguess is not None:
+            history[()] = Wordle(firstguess), 0.0
+        else:
+            history[curhist] = _next_guess(solver, hardmode)
+        if len(curhist) + 1 >= history_depth:
+            return
+        guess = history[curhist][0]
+        for code in np.unique(compare_many(guess, solver.list())).tolist():
+            if code == solved:
+                continue
+            solver.add_clue(Clue(guess, code))
+            visit(curhist + ((guess, code),))
+            solver.pop_clue()
+
+    visit(())
+    return history
+
+
+def solve_words(
+    player: PlaySession,
+    solver: WordleSolver,
+    words: Sequence[Wordle],
+    history: History,
+    hardmode: bool,
+    progress: bool = False,
+) -> Iterator[tuple[str, dict[str, object]]]:
+    for iword, word in enumerate(words):
+        guesses: list[tuple[Wordle, float, int]] = []
+        entry: dict[str, object] = {
             "tries": 0,
-            "guesses": [],
+            "guesses": guesses,
         }
         player.new(word)
         solver.reset()
-        solved = False
-        curhist: list[tuple[Wordle, tuple[int, ...]]] = []
-        print(f"{iword + 1:4d}/{totalwords}: {word}", end="\r", flush=True)
-        while not solved:
+        curhist: list[tuple[Wordle, int]] = []
+        if progress:
+            print(f"{iword + 1:4d}/{len(words)}: {word}", end="\r", flush=True)
+        while True:
             if tuple(curhist) in history:
                 guess, points = history[tuple(curhist)]
             else:
-                if hardmode:
-                    guess, points = solver.besth(1)[0]
-                else:
-                    guess, points = solver.best(1)[0]
+                guess, points = _next_guess(solver, hardmode)
                 if len(curhist) < history_depth:
                     history[tuple(curhist)] = guess, points
             clue = player.guess(guess)
-            data[str(word)]["guesses"].append(  # type: ignore
-                (guess, points, tuple(clue))
-            )
-            if all(i == 2 for i in clue):
-                solved = True
-                scores.append(player.tries)
-                data[str(word)]["tries"] = player.tries
-                continue
+            guesses.append((guess, points, clue.code))
+            if clue.solved:
+                entry["tries"] = player.tries
+                break
             solver.add_clue(clue)
-            curhist.append((guess, tuple(clue)))
-    fails: int = sum(1 for word in data if data[word]["tries"] > 6)  # type: ignore
+            curhist.append((guess, clue.code))
+        yield str(word), entry
 
-    return data, sum(scores) / len(scores), fails
+
+def iter_results(
+    wordlist: WordleList,
+    solvertype: Type[WordleSolver],
+    hardmode: bool = False,
+    firstguess: str | None = None,
+    tree: DecisionTree | None = None,
+    workers: int = 1,
+    skip: Collection[str] = (),
+) -> Iterator[tuple[str, dict[str, object]]]:
+    """Solve every answer not in skip, yielding each result as it finishes."""
+    _check_tree(tree, solvertype, hardmode, firstguess)
+    if tree is None:
+        # Load or build the shared pattern table once, before any solver needs it.
+        pattern_matrix(wordlist)
+    solvewords = tuple(
+        word.word for word in wordlist if word.weight > 0 and word.word not in skip
+    )
+    if not solvewords:
+        return
+    if workers > 1:
+        yield from _iter_parallel(
+            wordlist, solvertype, solvewords, hardmode, firstguess, tree, workers
+        )
+        return
+    player = PlaySession(wordlist, "hard" if hardmode else "easy")
+    solver = _make_solver(wordlist, solvertype, tree)
+    history: History = {}
+    if firstguess is not None and tree is None:
+        history[()] = Wordle(firstguess), 0.0
+    yield from solve_words(player, solver, solvewords, history, hardmode, True)
+
+
+def calc_average_score(
+    wordlist: WordleList,
+    solvertype: Type[WordleSolver],
+    hardmode: bool = False,
+    firstguess: str = None,
+    tree: DecisionTree | None = None,
+    workers: int = 1,
+) -> tuple[dict[str, dict[str, object]], float, int]:
+    """Solve every answer; workers > 1 splits the answers over processes."""
+    _check_tree(tree, solvertype, hardmode, firstguess)
+    data = dict(iter_results(wordlist, solvertype, hardmode, firstguess, tree, workers))
+    scores = [data[word]["tries"] for word in data]
+    fails: int = sum(1 for score in scores if score > 6)  # type: ignore
+
+    return data, sum(scores) / len(scores), fails  # type: ignore
+
+
+def read_log(path: str | Path) -> Iterator[dict[str, object]]:
+    """Entries of a benchmark log one at a time, each with its "word".
+
+    Logs hold one JSON object per line. A single-line JSON dict of the whole
+    run, as written by older versions, is read as well. A line cut short by
+    an interrupted run is skipped.
+    """
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "word" in entry:
+                yield entry
+            else:
+                for word, old in entry.items():
+                    yield {"word": word, **old}
+
+
+def run_logged(
+    logfile: str | Path,
+    wordlist: WordleList,
+    solvertype: Type[WordleSolver],
+    hardmode: bool = False,
+    firstguess: str | None = None,
+    tree: DecisionTree | None = None,
+    workers: int = 1,
+) -> tuple[float, int]:
+    """Like calc_average_score, appending each answer to logfile as it finishes.
+
+    Answers already in logfile are not solved again, so an interrupted run
+    resumes where it stopped. Returns the average and fails over the whole log.
+    A logfile that is not in the JSON lines format raises ValueError.
+    """
+    _check_tree(tree, solvertype, hardmode, firstguess)
+    path = Path(logfile)
+    done: set[str] = set()
+    total = fails = 0
+    if path.exists():
+        with open(path, "rb+") as f:
+            good = 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    entry = None
+                if not line.endswith(b"\n") and not isinstance(entry, dict):
+                    # Drop a line cut short so appended entries start on their own.
+                    break
+                if not isinstance(entry, dict) or "word" not in entry:
+                    # Older single-dict logs are read by read_log, not resumed.
+                    raise ValueError(f"{path} is not a JSON lines benchmark log")
+                if not line.endswith(b"\n"):
+                    break
+                good += len(line)
+                done.add(entry["word"])
+                total += entry["tries"]
+                fails += entry["tries"] > 6
+            f.truncate(good)
+    with open(path, "a") as f:
+        for word, entry in iter_results(
+            wordlist, solvertype, hardmode, firstguess, tree, workers, skip=done
+        ):
+            f.write(json.dumps({"word": word, **entry}) + "\n")
+            f.flush()
+            done.add(word)
+            total += entry["tries"]  # type: ignore
+            fails += entry["tries"] > 6  # type: ignore
+    return total / max(1, len(done)), fails
+
+
+def _iter_parallel(
+    wordlist: WordleList,
+    solvertype: Type[WordleSolver],
+    solvewords: tuple[Wordle, ...],
+    hardmode: bool,
+    firstguess: str | None,
+    tree: DecisionTree | None,
+    workers: int,
+) -> Iterator[tuple[str, dict[str, object]]]:
+    solver = _make_solver(wordlist, solvertype, tree)
+    history: History = {}
+    if tree is None:
+        history = opening_history(wordlist, solver, hardmode, firstguess)
+    pairs: list[tuple[str, int]] = list(zip(wordlist.words, wordlist.weights))
+    chunksize = min(64, -(-len(solvewords) // (4 * workers)))
+    chunks = [
+        solvewords[i : i + chunksize]  # noqa: E203
+        for i in range(0, len(solvewords), chunksize)
+    ]
+    with ProcessPoolExecutor(
+        workers,
+        initializer=_init_worker,
+        initargs=(solvertype, pairs, hardmode, history, tree),
+    ) as pool:
+        for ichunk, part in enumerate(pool.map(_solve_chunk, chunks)):
+            print(f"{ichunk + 1:4d}/{len(chunks)} chunks", end="\r", flush=True)
+            yield from part
+
+
+_worker: tuple[PlaySession, WordleSolver, History, bool] | None = None
+
+
+def _init_worker(
+    solvertype: Type[WordleSolver],
+    wordlist: list[tuple[str, int]],
+    hardmode: bool,
+    history: History,
+    tree: DecisionTree | None,
+) -> None:
+    global _worker
+    masterlist = WordleList(wordlist)
+    player = PlaySession(masterlist, "hard" if hardmode else "easy")
+    _worker = player, _make_solver(masterlist, solvertype, tree), history, hardmode
+
+
+def _solve_chunk(
+    words: tuple[Wordle, ...],
+) -> list[tuple[str, dict[str, object]]]:
+    assert _worker is not None
+    player, solver, history, hardmode = _worker
+    return list(solve_words(player, solver, words, history, hardmode))
 
 
 if __name__ == "__main__":
@@ -81,15 +311,29 @@ if __name__ == "__main__":
         parser.add_argument(
             "-H", "--hard", action="store_true", help="Solve in hardmode."
         )
+        parser.add_argument(
+            "-j",
+            "--workers",
+            type=int,
+            default=1,
+            help="Split the answers over this many processes. [default: %(default)s]",
+        )
+        parser.add_argument(
+            "-t",
+            "--tree",
+            type=Path,
+            default=None,
+            metavar="FILE",
+            help="Play a compiled decision tree, compiling it into FILE first if "
+            "it does not exist.",
+        )
         return parser.parse_args()
 
     def main() -> None:
         args = parse()
         solver = solvers.solversdict[args.solver]
         wordlist = loaders.load_wordlelist()
-        if args.firstguess is not None and Wordle(args.firstguess) not in (
-            word.word for word in wordlist
-        ):
+        if args.firstguess is not None and Wordle(args.firstguess) not in wordlist.ids:
             print(
                 f"WARNING: {args.firstguess} is not in the wordlist.", file=sys.stderr
             )
@@ -98,18 +342,26 @@ if __name__ == "__main__":
         else:
             h = "h" if args.hard else ""
             if args.firstguess is not None:
-                logfile = Path(f"benchmark_{args.solver}{h}_{args.firstguess}.json")
+                logfile = Path(f"benchmark_{args.solver}{h}_{args.firstguess}.jsonl")
+            else:
+                logfile = Path(f"benchmark_{args.solver}{h}.jsonl")
+        tree = None
+        if args.tree is not None:
+            if args.tree.exists():
+                tree = DecisionTree.load(args.tree)
+                _check_tree(tree, solver, args.hard, args.firstguess)
             else:
-                logfile = Path(f"benchmark_{args.solver}{h}.json")
-        data, score, fails = calc_average_score(
+                tree = compile_tree(wordlist, solver, args.hard, args.firstguess)
+                tree.save(args.tree)
+        score, fails = run_logged(
+            logfile,
             wordlist,
             solver,
             hardmode=args.hard,
             firstguess=args.firstguess,
+            tree=tree,
+            workers=args.workers,
         )
-        if logfile is not None:
-            with open(logfile, "w") as f:
-                json.dump(data, f)
         print(f"For solver: {args.solver} average score: {score:.2f}, fails: {fails}")
 
     main()
@@ -1,13 +1,16 @@
 import json
-import math
 from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import Iterable
 
 import numpy as np
 from numpy.linalg import lstsq
 
+from wordle.analysis.benchmark import read_log
 from wordle.loaders import load_wordlelist
+from wordle.patterns import CHUNK_CELLS, blacks
 from wordle.solvers import PruningWordleList
-from wordle.wordle import Clue
+from wordle.wordle import encode
 
 
 def parse() -> Namespace:
@@ -21,18 +24,20 @@ def parse() -> Namespace:
 
 def main() -> None:
     args = parse()
-    with open(args.file) as f:
-        data = json.load(f)
-
     wl = PruningWordleList(load_wordlelist())
 
-    table = calc_datatable(data, wl)
+    steps = calc_steps(read_log(args.file), wl)
+    length = len(wl.masterlist.words[0])
+    table = tabulate(*steps, length)
+    tpes = fit_turns_per_entropy(*steps, length)
 
+    # The table is a single JSON document even when the log is line-delimited.
+    name = Path(args.file).with_suffix(".json").name
     if args.output is None:
-        if args.file[:9] == "benchmark":
-            outfile = f"entval_{args.file[9:]}"
+        if name[:9] == "benchmark":
+            outfile = f"entval_{name[9:]}"
         else:
-            outfile = f"entval_{args.file}"
+            outfile = f"entval_{name}"
     else:
         outfile = args.output
     with open(outfile, "w") as f:
@@ -43,7 +48,7 @@ def main() -> None:
 
     for black, data in enumerate(table):
         x, y = zip(*data)
-        tpe = calc_slope(x, y, intercept=1.0)
+        tpe = tpes[black]
         if args.plot:
             plt.clf()
             plt.plot(
@@ -61,7 +66,7 @@ def main() -> None:
             plt.xlabel("Entropy")
             plt.ylabel("Tries")
             plt.title(f"Entropy-Tries relation for {black} slope {tpe:.2f}")
-            plt.savefig(f"entval_{black}_{args.file[9:-5]}.png")
+            plt.savefig(f"entval_{black}_{name[9:-5]}.png")
         else:
             if black > 0:
                 print(f"{black} black: {tpe:.4f}")
@@ -69,24 +74,86 @@ def main() -> None:
                 print(f"Average: {tpe:.4f}")
 
 
-def calc_datatable(data: dict, wl: PruningWordleList) -> list[list[tuple[float, int]]]:
-    table: list[list[tuple[float, int]]] = [[] for _ in range(len(list(data)[0]) + 1)]
-
-    for keydata in data.values():
-        wl.reset()
-        for tries, guess in zip(
-            range(keydata["tries"] - 1, -1, -1), keydata["guesses"]
-        ):
-            if tries == 0:
-                break
-            wl.add_clue(Clue(guess[0], guess[2]))
-            blacks = guess[2].count(0)
-            entropy = math.log2(len(wl.list()))
-            table[0].append((entropy, tries))
-            table[blacks].append((entropy, tries))
+def calc_steps(
+    data: dict | Iterable[dict], wl: PruningWordleList
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Entropy, tries left and blacks of every logged clue but the winning one.
+
+    The candidates left after a clue are the answers agreeing with the game's
+    answer on every clue so far, counted for all games at once from the
+    pattern table.
+    """
+    entries = data.values() if isinstance(data, dict) else data
+    guesses: list[str] = []
+    codes: list[int] = []
+    games: list[int] = []
+    depths: list[int] = []
+    tries: list[int] = []
+    for igame, keydata in enumerate(entries):
+        for idepth, guess in enumerate(keydata["guesses"][: keydata["tries"] - 1]):
+            guesses.append(guess[0])
+            # Old logs hold the clue as a list of signals, not its code.
+            clue = guess[2]
+            codes.append(clue if isinstance(clue, int) else encode(clue))
+            games.append(igame)
+            depths.append(idepth)
+            tries.append(keydata["tries"] - 1 - idepth)
+    wl.reset()
+    code = np.array(codes, dtype=np.int64)
+    game = np.array(games, dtype=np.intp)
+    depth = np.array(depths, dtype=np.intp)
+    counts = np.zeros(len(code), dtype=np.int64)
+    ngames = game[-1] + 1 if len(game) else 0
+    step = max(1, CHUNK_CELLS // max(1, wl.size))
+    for start in range(0, ngames, step):
+        # Steps are in game order, so a block of games is a slice of steps.
+        lo, hi = np.searchsorted(game, [start, start + step])
+        left = np.ones((min(step, ngames - start), wl.size), dtype=bool)
+        for d in range(depth[lo:hi].max() + 1 if hi > lo else 0):
+            sel = lo + np.flatnonzero(depth[lo:hi] == d)
+            block = wl.codes_block([guesses[i] for i in sel])
+            rows = game[sel] - start
+            left[rows] &= block == code[sel, None]
+            counts[sel] = left[rows].sum(axis=1)
+    length = len(wl.masterlist.words[0])
+    return np.log2(counts), np.array(tries), blacks(code, length)
+
+
+def calc_datatable(
+    data: dict | Iterable[dict], wl: PruningWordleList
+) -> list[list[tuple[float, int]]]:
+    """Entropy/tries pairs per black count, with every pair in table[0]."""
+    return tabulate(*calc_steps(data, wl), len(wl.masterlist.words[0]))
+
+
+def tabulate(
+    entropy: np.ndarray, tries: np.ndarray, black: np.ndarray, length: int
+) -> list[list[tuple[float, int]]]:
+    pairs = list(zip(entropy.tolist(), tries.tolist()))
+    table: list[list[tuple[float, int]]] = [
+        [pairs[i] for i in np.flatnonzero(black == b)] for b in range(length + 1)
+    ]
+    # Zero-black pairs land in table[0] twice, next to each other.
+    table[0] = [pairs[i] for i in np.repeat(np.arange(len(pairs)), 1 + (black == 0))]
     return table
 
 
+def fit_turns_per_entropy(
+    entropy: np.ndarray, tries: np.ndarray, black: np.ndarray, length: int
+) -> np.ndarray:
+    """calc_turns_per_entropy(calc_datatable(...)) straight from calc_steps.
+
+    Each slope is a least-squares fit of tries - 1 = tpe * entropy through the
+    origin, so all of them come from two weighted bincounts.
+    """
+    xy = np.bincount(black, entropy * (tries - 1.0), minlength=length + 1)
+    xx = np.bincount(black, entropy * entropy, minlength=length + 1)
+    xy[0] += (entropy * (tries - 1.0)).sum()
+    xx[0] += (entropy * entropy).sum()
+    # Like lstsq, a black count without data fits a zero slope.
+    return np.divide(xy, xx, out=np.zeros_like(xy), where=xx > 0)
+
+
 def calc_slope(x: list[float], y: list[float], intercept: float = 0.0) -> float:
     m, _, _, _ = lstsq(np.array(x)[:, np.newaxis], np.array(y) - intercept, rcond=None)
     return m[0]
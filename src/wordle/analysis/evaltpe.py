@@ -1,8 +1,18 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
 import numpy as np
 
 from wordle import loaders, solvers
-from wordle.analysis.benchmark import calc_average_score
-from wordle.analysis.entval import calc_datatable, calc_turns_per_entropy
+from wordle.analysis.benchmark import solve_words
+from wordle.analysis.entval import calc_steps, fit_turns_per_entropy
+from wordle.core import PlaySession
+from wordle.decisiontree import TreeSolver, compile_tree
+from wordle.patterns import pattern_matrix
+from wordle.solvers import PruningWordleList
+from wordle.wordle import WordleList
 
 testwords = [
     "soare",
@@ -108,32 +118,115 @@ testwords = [
 ]
 
 
-def main():
-    solver = solvers.solversdict["entropy"]
-    wordlist = loaders.load_wordlelist()
-    pruner = solvers.PruningWordleList(wordlist)
-    table = []
-    for i, firstguess in enumerate(testwords):
-        print(
-            f"                    {firstguess}: {i+1} / {len(testwords)}",
-            end="\r",
-            flush=True,
-        )
-        data, _, _ = calc_average_score(
-            wordlist,
-            solver,
-            False,
-            firstguess=firstguess,
+_worker: tuple[WordleList, PlaySession, PruningWordleList, bool] | None = None
+
+
+def _init_worker(wordlist: list[tuple[str, int]], hard: bool) -> None:
+    global _worker
+    masterlist = WordleList(wordlist)
+    player = PlaySession(masterlist, "hard" if hard else "easy")
+    _worker = masterlist, player, PruningWordleList(masterlist), hard
+
+
+def calc_row(firstguess: str) -> tuple[str, list[float]]:
+    """Turns per entropy of a full benchmark opening with firstguess."""
+    assert _worker is not None
+    wordlist, player, pruner, hard = _worker
+    # Compiling the tree searches each reachable state once for all answers.
+    tree = compile_tree(wordlist, solvers.EntropySolver, hard, firstguess)
+    answers = [word.word for word in wordlist if word.weight > 0]
+    games = solve_words(player, TreeSolver(wordlist, tree), answers, {}, hard)
+    entries = (entry for _, entry in games)
+    steps = calc_steps(entries, pruner)
+    return firstguess, fit_turns_per_entropy(*steps, len(answers[0])).tolist()
+
+
+def sweep(
+    firstguesses: list[str],
+    output: Path,
+    hard: bool = False,
+    workers: int = 1,
+    wordlist: WordleList | None = None,
+) -> np.ndarray:
+    """Append a row per first guess to output, skipping those already there.
+
+    Returns the rows of firstguesses in their order, old and new.
+    """
+    if wordlist is None:
+        wordlist = loaders.load_wordlelist()
+    # Build the pattern table once; workers load it from the disk cache.
+    pattern_matrix(wordlist)
+    # The first guess and the length + 1 slopes of fit_turns_per_entropy.
+    ncols = len(wordlist.words[0]) + 2
+    done: dict[str, list[float]] = {}
+    if output.exists():
+        with open(output, "rb+") as f:
+            good = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Drop a row cut short so appended rows start on their own.
+                    break
+                good += len(line)
+                cols = line.decode().rstrip("\n").split(",")
+                try:
+                    row = [float(col) for col in cols[1:]]
+                except ValueError:
+                    continue
+                if len(cols) == ncols:
+                    done[cols[0]] = row
+            f.truncate(good)
+    todo = [word for word in firstguesses if word not in done]
+    pairs: list[tuple[str, int]] = list(zip(wordlist.words, wordlist.weights))
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(pairs, hard)
         )
-        table.append(calc_turns_per_entropy(calc_datatable(data, pruner)))
-    table = np.array(table)
+    try:
+        with open(output, "a") as f:
+            if pool is not None:
+                rows: Iterator[tuple[str, list[float]]] = pool.map(calc_row, todo)
+            else:
+                _init_worker(pairs, hard)
+                rows = map(calc_row, todo)
+            for i, (firstguess, row) in enumerate(rows):
+                print(
+                    f"                    {firstguess}: {i+1} / {len(todo)}",
+                    end="\r",
+                    flush=True,
+                )
+                f.write(",".join([firstguess] + [str(col) for col in row]) + "\n")
+                f.flush()
+                done[firstguess] = row
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return np.array([done[word] for word in firstguesses])
+
+
+def main() -> None:
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Fit EntropySolver.tpe over many openers.")
+    parser.add_argument("-H", "--hard", action="store_true", help="Hard mode.")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Openers to benchmark at once. [default: %(default)s]",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=None,
+        help="CSV to append to. [default: tpe_easy.csv or tpe_hard.csv]",
+    )
+    args = parser.parse_args()
+    output = args.output or Path(f"tpe_{'hard' if args.hard else 'easy'}.csv")
+    table = sweep(testwords, output, args.hard, args.workers)
     print(table.mean(axis=0))
-    with open("tpe_easy.csv", "w") as f:
-        for i, row in enumerate(table):
-            f.write(f"{testwords[i]}")
-            for j, col in enumerate(row):
-                f.write(f",{col}")
-            f.write("\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,153 @@
+import json
+import platform
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from wordle import loaders, solvers
+from wordle.patterns import pattern_matrix
+from wordle.wordle import (
+    Clue,
+    HardModeFilter,
+    WordleList,
+    compare,
+    compare_many,
+    compare_uncached,
+)
+
+TESTS = Path(__file__).parents[3] / "tests"
+DATASETS = ["official", "testwl", "ef3000"] + [f"sowpods{n}" for n in range(4, 9)]
+
+
+def load_dataset(name: str, tests: Path = TESTS) -> WordleList:
+    if name == "official":
+        return loaders.load_wordlelist()
+    if name.startswith("sowpods"):
+        return loaders.load_wordlelist(int(name[len("sowpods") :]))  # noqa: E203
+    return loaders.load_wordlelist(5, tests / f"{name}.txt")
+
+
+def measure(fn: Callable[[], object], budget: float = 0.2, repeat: int = 3) -> float:
+    """Best seconds per call over repeat runs of about budget seconds each."""
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget or number >= 1 << 20:
+            break
+        number *= 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def bench_dataset(
+    name: str, tests: Path = TESTS, budget: float = 0.2
+) -> list[dict[str, object]]:
+    wordlist = load_dataset(name, tests)
+    pairs: list[tuple[str, int]] = list(zip(wordlist.words, wordlist.weights))
+    answers = [wordlist.words[i] for i in wordlist.answers]
+    guess, key = answers[0], answers[len(answers) // 2]
+    clue = Clue(guess, compare(guess, key))
+    # Build or load the pattern table outside of the solver timings.
+    start = time.perf_counter()
+    pattern_matrix(wordlist)
+    patterns = time.perf_counter() - start
+    solver = solvers.StatisticalSolver(wordlist)
+    hmf = HardModeFilter()
+    hmf.add_clue(clue)
+
+    def load() -> WordleList:
+        # Read the compiled shard again instead of hitting the process cache.
+        loaders.SHARDS.clear()
+        return load_dataset(name, tests)
+
+    def add_clue() -> None:
+        solver.add_clue(clue)
+        solver.pop_clue()
+
+    cases: dict[str, Callable[[], object]] = {
+        "compare": lambda: compare(guess, key),
+        "compare_uncached": lambda: compare_uncached(guess, key),
+        "compare_many": lambda: compare_many(guess, answers),
+        "WordleList": lambda: WordleList(pairs),
+        "load_wordlelist": load,
+        "PruningWordleList.add_clue+pop_clue": add_clue,
+        "StatisticalSolver.score": lambda: solver.score(guess),
+        "StatisticalSolver.best": lambda: solver.best(1),
+        "StatisticalSolver.besth": lambda: solver.besth(1),
+        "HardModeFilter.filter": lambda: list(hmf.filter(wordlist.words)),
+    }
+    results: list[dict[str, object]] = [
+        {"case": "pattern_matrix", "seconds": patterns, "first_call": True}
+    ]
+    for case, fn in cases.items():
+        results.append({"case": case, "seconds": measure(fn, budget)})
+    for result in results:
+        result.update(dataset=name, words=len(wordlist), answers=len(wordlist.answers))
+    return results
+
+
+def run(
+    datasets: list[str] = DATASETS, tests: Path = TESTS, budget: float = 0.2
+) -> dict[str, object]:
+    results = []
+    for name in datasets:
+        print(f"{name}...", end="\r", flush=True)
+        results += bench_dataset(name, tests, budget)
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser, Namespace
+
+    def parse() -> Namespace:
+        parser = ArgumentParser(description="Time the core operations.")
+        parser.add_argument(
+            "-d",
+            "--dataset",
+            choices=DATASETS,
+            action="append",
+            default=None,
+            help="Word list to time, may be repeated. [default: all]",
+        )
+        parser.add_argument(
+            "-o", "--output", type=Path, default=Path("microbench.json")
+        )
+        parser.add_argument("--tests", type=Path, default=TESTS)
+        parser.add_argument(
+            "-b",
+            "--budget",
+            type=float,
+            default=0.2,
+            help="Seconds to spend per timing run. [default: %(default)s]",
+        )
+        return parser.parse_args()
+
+    def main() -> None:
+        args = parse()
+        report = run(args.dataset or DATASETS, args.tests, args.budget)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+        for result in report["results"]:  # type: ignore
+            print(
+                f"{result['dataset']:>9} {result['case']:<36} "
+                f"{result['seconds'] * 1e6:12.1f} us"
+            )
+
+    main()
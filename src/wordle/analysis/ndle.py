@@ -1,14 +1,13 @@
-from typing import Iterable
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
 import numpy as np
 
-from wordle import core, loaders, solvers
-from wordle.wordle import Wordle, compare
-
-wl = loaders.load_wordlelist()
-pruner = solvers.PruningWordleList(wl)
-player = core.PlaySession(wl)
-cl = pruner.list()
+from wordle import loaders
+from wordle.patterns import CHUNK_CELLS, pattern_matrix
+from wordle.wordle import WordleList, code_dtype
 
 freql = [
     "e",
@@ -38,44 +37,355 @@ freql = [
     "q",
     "j",
 ]
-freqs = set(freql[:18])
-
-cli = []
-for word in cl:
-    if len(set(word)) == 5 and set(word).issubset(freqs):
-        cli.append(word)
-
-
-def score(words: Iterable[core.Wordle]) -> tuple[float, list[int]]:
-    tries: dict[tuple[int, ...], int] = {}
-    for ans in cl:
-        s: list[int] = []
-        for word in words:
-            s.extend(compare(word, ans))
-        st: tuple[int, ...] = tuple(s)
-        tries[st] = tries.get(st, 0) + 1
-    tries_list = list(tries.values())
-    data = np.array(tries_list, dtype=np.float64)
-    n = sum(data)
-    return np.sum(data * np.log2(data)) / n, tries_list
-
-
-data: list[tuple[Wordle, Wordle, float]] = []
-for i, w1 in enumerate(cli):
-    for w2 in cli[i + 1 :]:  # noqa: E203
-        if len(set(w1) | set(w2)) < 10:
-            continue
-        print(f"{i}/{len(cli)} {w1} {w2}", end="\r")
-        data.append((w1, w2, score([w1, w2])[0]))
-
-scores = [d[2] for d in data]
-
-ranks = np.argsort(scores)
-data = [data[i] for i in ranks]
-
-for i in range(10):
-    print(data[i])
-
-with open("2word.csv", "w") as f:
-    for d in data:
-        f.write(f"{d[0]},{d[1]},{d[2]}\n")
+
+BLOCK = 256
+
+
+def candidates(
+    wordlist: WordleList, cutoff: int | None = 18, guesses: bool = False
+) -> list[str]:
+    """Answers, or all guesses, with distinct letters among the cutoff most frequent.
+
+    With no cutoff every answer, or every guess, is a candidate.
+    """
+    words: list[str]
+    if guesses:
+        words = list(wordlist.words)
+    else:
+        words = [wordlist.words[i] for i in wordlist.answers]
+    if not cutoff:
+        return words
+    freqs = set(freql[:cutoff])
+    return [
+        word
+        for word in words
+        if len(set(word)) == len(word) and set(word).issubset(freqs)
+    ]
+
+
+def group_scores(codes: np.ndarray) -> np.ndarray:
+    """sum(n * log2(n)) / N of each row's groups of equal codes."""
+    codes = np.sort(codes, axis=1)
+    rows, total = codes.shape
+    starts = np.ones(codes.shape, dtype=bool)
+    starts[:, 1:] = codes[:, 1:] != codes[:, :-1]
+    # Group sizes are the gaps between consecutive group starts.
+    flat = np.flatnonzero(np.append(starts.ravel(), True))
+    n = np.diff(flat).astype(np.float64)
+    row = flat[:-1] // total
+    return np.bincount(row, n * np.log2(n), minlength=rows) / total
+
+
+def pair_scores(first: np.ndarray, block: np.ndarray, length: int) -> np.ndarray:
+    """Scores of one guess's clue codes paired with each row of block."""
+    # Joint codes fit twice the clue width, and narrow integers sort fastest.
+    dtype = code_dtype(2 * length)
+    joint = first.astype(dtype) * dtype(3**length) + block.astype(dtype)
+    return group_scores(joint)
+
+
+_worker: tuple[np.ndarray, np.ndarray, np.ndarray, int] | None = None
+
+
+def _init_worker(
+    wordlist: list[tuple[str, int]],
+    rows: np.ndarray,
+    singles: np.ndarray,
+    masks: np.ndarray,
+) -> None:
+    global _worker
+    patterns = pattern_matrix(WordleList(wordlist))
+    _worker = patterns.matrix[rows], singles, masks, patterns.length
+
+
+def _search(
+    firsts: range, n: int, threshold: float = np.inf
+) -> list[tuple[float, int, int]]:
+    """The n best pairs (i, j > i) with i in firsts, worse than threshold dropped.
+
+    Joint entropy is at most the sum of the two single entropies, so a pair
+    scores at least singles[i] + singles[j] - log2(N). Candidates are sorted
+    by single score, which makes that bound grow along both i and j.
+    """
+    assert _worker is not None
+    codes, singles, masks, length = _worker
+    offset = np.log2(codes.shape[1])
+    best: list[tuple[float, int, int]] = []
+    step = max(1, min(BLOCK, CHUNK_CELLS // codes.shape[1]))
+    for i in firsts:
+        if i + 1 >= len(singles) or singles[i] + singles[i + 1] - offset >= threshold:
+            break
+        stop = len(singles)
+        if threshold < np.inf:
+            bound = threshold + offset - singles[i]
+            stop = i + 1 + int(np.searchsorted(singles[i + 1 :], bound))  # noqa: E203
+        js = np.arange(i + 1, stop)
+        js = js[(masks[js] & masks[i]) == 0]
+        for start in range(0, len(js), step):
+            chunk = js[start : start + step]  # noqa: E203
+            if threshold < np.inf:
+                chunk = chunk[singles[chunk] < threshold + offset - singles[i]]
+            if not len(chunk):
+                break
+            scores = pair_scores(codes[i], codes[chunk], length)
+            pairs = zip(scores.tolist(), [i] * len(chunk), chunk.tolist())
+            best = heapq.nsmallest(n, best + list(pairs))
+            if len(best) == n:
+                threshold = min(threshold, best[-1][0])
+    return best
+
+
+def _rank(
+    wordlist: WordleList, words: list[str] | None
+) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """words sorted by single-word score, with their pattern rows and scores."""
+    if words is None:
+        words = list(wordlist.words)
+    patterns = pattern_matrix(wordlist)
+    rows = np.array([patterns.rows[word] for word in words], dtype=np.intp)
+    singles = group_scores(patterns.matrix[rows])
+    order = np.argsort(singles, kind="stable")
+    return [words[i] for i in order], rows[order], singles[order]
+
+
+def best_pairs(
+    wordlist: WordleList,
+    words: list[str] | None = None,
+    n: int = 10,
+    disjoint: bool = False,
+    workers: int = 1,
+) -> list[tuple[str, str, float]]:
+    """The n best pairs of words, optionally only pairs sharing no letter.
+
+    A pair scores the mean log2 size of the answer group left after both
+    clues, sum(n * log2(n)) / N over its joint clue groups; lower is better.
+    """
+    words, rows, singles = _rank(wordlist, words)
+    masks = np.zeros(len(words), dtype=np.int64)
+    if disjoint:
+        for k, word in enumerate(words):
+            for letter in word:
+                masks[k] |= 1 << (ord(letter) - ord("a"))
+    pairs: list[tuple[str, int]] = list(zip(wordlist.words, wordlist.weights))
+    initargs = (pairs, rows, singles, masks)
+    # The best openers pair up first, which gives a tight bound for the rest.
+    seed = min(len(words), BLOCK)
+    _init_worker(*initargs)
+    best = _search(range(seed), n)
+    threshold = best[-1][0] if len(best) == n else np.inf
+    rest = range(seed, len(words))
+    if workers > 1 and len(rest):
+        size = max(1, -(-len(rest) // (4 * workers)))
+        shards = [rest[k : k + size] for k in range(0, len(rest), size)]  # noqa: E203
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=initargs
+        ) as pool:
+            futures = [pool.submit(_search, s, n, threshold) for s in shards]
+            for future in futures:
+                best = heapq.nsmallest(n, best + future.result())
+    else:
+        best = heapq.nsmallest(n, best + _search(rest, n, threshold))
+    return [(words[i], words[j], score) for score, i, j in best]
+
+
+def _extend(
+    labels: np.ndarray, score: float, taken: tuple[int, ...], n: int, threshold: float
+) -> list[tuple[float, int]]:
+    """The n best words to add to a set whose groups are labels.
+
+    Adding a word can raise the entropy by at most the word's own, so a word
+    scores at least score + singles[j] - log2(N) here, growing along j.
+    """
+    assert _worker is not None
+    codes, singles, _, length = _worker
+    total = codes.shape[1]
+    offset = np.log2(total)
+    best: list[tuple[float, int]] = []
+    # Answers already alone in their group add nothing, whatever comes next.
+    shared = np.flatnonzero(np.bincount(labels)[labels] > 1)
+    if not len(shared):
+        return []
+    if 2 * len(shared) > total:
+        shared, columns = np.arange(total), codes
+    else:
+        columns = codes[:, shared]
+    step = max(1, min(BLOCK, CHUNK_CELLS // len(shared)))
+    # Narrow integers sort fastest.
+    dtype = np.min_scalar_type((labels.max() + 1) * 3**length - 1)
+    base = labels[shared].astype(dtype) * dtype.type(3**length)
+    stop = int(np.searchsorted(singles, threshold + offset - score))
+    js = np.setdiff1d(np.arange(stop), taken)
+    for start in range(0, len(js), step):
+        chunk = js[start : start + step]  # noqa: E203
+        chunk = chunk[singles[chunk] < threshold + offset - score]
+        if not len(chunk):
+            break
+        block = columns[chunk].astype(dtype)
+        scores = group_scores(base + block) * (len(shared) / total)
+        best = heapq.nsmallest(n, best + list(zip(scores.tolist(), chunk.tolist())))
+        if len(best) == n:
+            threshold = min(threshold, best[-1][0])
+    return best
+
+
+def _merge(
+    found: dict[tuple[int, ...], tuple[float, int, int]],
+    istate: int,
+    taken: tuple[int, ...],
+    extensions: list[tuple[float, int]],
+) -> None:
+    for score, j in extensions:
+        # The same set reached in another order is the same partition.
+        key = tuple(sorted(taken + (j,)))
+        if key not in found:
+            found[key] = score, istate, j
+
+
+def beam_search(
+    wordlist: WordleList,
+    k: int,
+    beam: int = 64,
+    words: list[str] | None = None,
+    workers: int = 1,
+) -> list[tuple[tuple[str, ...], float, float]]:
+    """The best fixed k-word openers found keeping the beam best partial sets.
+
+    Each set keeps its answers' group labels under the joint clue, so adding
+    a word only refines that partition. Returns (words, entropy, expected
+    remaining candidates) per set, best first.
+    """
+    words, rows, singles = _rank(wordlist, words)
+    masks = np.zeros(len(words), dtype=np.int64)
+    pairs: list[tuple[str, int]] = list(zip(wordlist.words, wordlist.weights))
+    initargs = (pairs, rows, singles, masks)
+    _init_worker(*initargs)
+    assert _worker is not None
+    codes, length = _worker[0], _worker[3]
+    states: list[tuple[float, tuple[int, ...], np.ndarray]] = [
+        (float(singles[j]), (j,), np.unique(codes[j], return_inverse=True)[1])
+        for j in range(min(beam, len(words)))
+    ]
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs)
+    try:
+        for _ in range(k - 1):
+            found: dict[tuple[int, ...], tuple[float, int, int]] = {}
+            if pool is not None:
+                futures = [
+                    pool.submit(_extend, labels, score, taken, beam, np.inf)
+                    for score, taken, labels in states
+                ]
+                for istate, future in enumerate(futures):
+                    _merge(found, istate, states[istate][1], future.result())
+            else:
+                threshold = np.inf
+                for istate, (score, taken, labels) in enumerate(states):
+                    extensions = _extend(labels, score, taken, beam, threshold)
+                    _merge(found, istate, taken, extensions)
+                    if len(found) >= beam:
+                        scores = (value[0] for value in found.values())
+                        threshold = heapq.nsmallest(beam, scores)[-1]
+            best = heapq.nsmallest(beam, found.values())
+            states = [
+                (
+                    score,
+                    states[istate][1] + (j,),
+                    np.unique(
+                        states[istate][2] * 3**length + codes[j], return_inverse=True
+                    )[1],
+                )
+                for score, istate, j in best
+            ]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    total = codes.shape[1]
+    return [
+        (
+            tuple(words[j] for j in taken),
+            float(np.log2(total) - score),
+            float((np.bincount(labels) ** 2).sum() / total),
+        )
+        for score, taken, labels in states
+    ]
+
+
+def main() -> None:
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Find the best fixed opening guesses.")
+    parser.add_argument(
+        "-k",
+        "--words",
+        type=int,
+        default=2,
+        help="Openers per set. Pairs are searched exhaustively, larger sets with "
+        "a beam search. [default: %(default)s]",
+    )
+    parser.add_argument(
+        "-b",
+        "--beam",
+        type=int,
+        default=64,
+        help="Partial sets kept per step for -k 3 and up. [default: %(default)s]",
+    )
+    parser.add_argument(
+        "-c",
+        "--cutoff",
+        type=int,
+        default=18,
+        help="Only pair words with distinct letters among the N most frequent, "
+        "sharing no letter. 0 searches every pair. Pairs only. "
+        "[default: %(default)s]",
+    )
+    parser.add_argument(
+        "-a",
+        "--all-guesses",
+        action="store_true",
+        help="Pair any allowed guess, not only answers. Pairs only.",
+    )
+    parser.add_argument(
+        "-l", "--length", type=int, default=5, help="[default: %(default)s]"
+    )
+    parser.add_argument("-w", "--wordfile", type=Path, default=None)
+    parser.add_argument(
+        "-n", "--top", type=int, default=100, help="[default: %(default)s]"
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="[default: %(default)s]",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, default=None, help="[default: <k>word.csv]"
+    )
+    args = parser.parse_args()
+
+    wordlist = loaders.load_wordlelist(args.length, args.wordfile)
+    output = args.output or Path(f"{args.words}word.csv")
+    if args.words == 2:
+        words = candidates(wordlist, args.cutoff, args.all_guesses)
+        data = best_pairs(
+            wordlist, words, args.top, disjoint=bool(args.cutoff), workers=args.workers
+        )
+        for d in data[:10]:
+            print(d)
+        with open(output, "w") as f:
+            for d in data:
+                f.write(f"{d[0]},{d[1]},{d[2]}\n")
+        return
+    sets = beam_search(
+        wordlist, args.words, max(args.beam, args.top), workers=args.workers
+    )
+    for opener, entropy, expected in sets[:10]:
+        print(f"{' '.join(opener)}  entropy {entropy:.4f}  expected {expected:.4f}")
+    with open(output, "w") as f:
+        for opener, entropy, expected in sets[: args.top]:
+            f.write(f"{','.join(opener)},{entropy},{expected}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Sets of indices in range(size), packed 64 to a machine word."""
+
+import numpy as np
+
+
+def pack(mask: np.ndarray) -> np.ndarray:
+    bits = np.packbits(mask, bitorder="little")
+    return np.pad(bits, (0, -len(bits) % 8)).view(np.uint64)
+
+
+def unpack(bits: np.ndarray, size: int) -> np.ndarray:
+    return np.unpackbits(bits.view(np.uint8), count=size, bitorder="little").view(bool)
+
+
+def full(size: int) -> np.ndarray:
+    return pack(np.ones(size, dtype=bool))
+
+
+def from_indices(indices: np.ndarray, size: int) -> np.ndarray:
+    mask = np.zeros(size, dtype=bool)
+    mask[indices] = True
+    return pack(mask)
+
+
+def to_indices(bits: np.ndarray, size: int) -> np.ndarray:
+    return np.flatnonzero(unpack(bits, size))
+
+
+def count(bits: np.ndarray, size: int) -> int:
+    return int(np.count_nonzero(unpack(bits, size)))
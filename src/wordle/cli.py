@@ -1,11 +1,14 @@
+import sys
 from argparse import ArgumentParser, Namespace
 from pathlib import Path
 
-from wordle import repl
+from wordle import repl, server
 
 
 def parse() -> Namespace:
-    parser = ArgumentParser(description="Wordle")
+    parser = ArgumentParser(
+        description="Wordle", epilog="Run 'python -m wordle serve -h' for the server."
+    )
     parser.add_argument(
         "-m",
         "--mode",
@@ -47,11 +50,23 @@ def parse() -> Namespace:
         help="Algorithm to use for solving. Available: "
         f"{', '.join(repl.solversdict.keys())}",
     )
+    parser.add_argument(
+        "-t",
+        "--tree",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Decision tree compiled by wordle.analysis.benchmark --tree. best and\
+ besth read guesses from it instead of the solver.",
+    )
     args = parser.parse_args()
     return args
 
 
 def main() -> None:
+    if sys.argv[1:2] == ["serve"]:
+        server.main(sys.argv[2:])
+        return
     args = parse()
     repl.REPLoop(
         mode=args.mode,
@@ -59,4 +74,5 @@ def main() -> None:
         length=args.length,
         wordfile=args.wordfile,
         solver=args.solver,
+        tree=args.tree,
     )
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import numpy as np
+
+from wordle import bitset
+from wordle.wordle import Clue, WordleList
+
+
+class ClueIndex:
+    """Bitsets of words by letter position and by letter count.
+
+    Any clue then turns into a handful of bitset intersections instead of a
+    compare() against every word.
+    """
+
+    def __init__(self, letters: np.ndarray):
+        self.size, self.length = letters.shape
+        self.empty = bitset.pack(np.zeros(self.size, dtype=bool))
+        self.full = bitset.full(self.size)
+        self.alphabet: dict[int, int] = {
+            int(c): i for i, c in enumerate(np.unique(letters))
+        }
+        dense = np.searchsorted(np.array(sorted(self.alphabet)), letters)
+        self.at = [
+            [bitset.pack(dense[:, i] == a) for a in range(len(self.alphabet))]
+            for i in range(self.length)
+        ]
+        counts = np.zeros((self.size, len(self.alphabet)), dtype=np.uint8)
+        for i in range(self.length):
+            counts[np.arange(self.size), dense[:, i]] += 1
+        self.atleast = [
+            [bitset.pack(counts[:, a] >= k) for k in range(1, self.length + 1)]
+            for a in range(len(self.alphabet))
+        ]
+
+    def position(self, letter: str, i: int) -> np.ndarray:
+        """Words with letter at position i."""
+        a = self.alphabet.get(ord(letter))
+        return self.empty if a is None else self.at[i][a]
+
+    def minimum(self, letter: str, k: int) -> np.ndarray:
+        """Words with at least k copies of letter."""
+        a = self.alphabet.get(ord(letter))
+        if k <= 0:
+            return self.full
+        if a is None or k > self.length:
+            return self.empty
+        return self.atleast[a][k - 1]
+
+    def exact(self, letter: str, k: int) -> np.ndarray:
+        """Words with exactly k copies of letter."""
+        return self.minimum(letter, k) & ~self.minimum(letter, k + 1)
+
+    def match(self, clue: Clue) -> np.ndarray:
+        """Words that would give this clue to its guess, as a bitset."""
+        word = clue.word
+        if len(word) != self.length:
+            raise ValueError("Length mismatch")
+        result = self.full.copy()
+        for letter in set(word):
+            signals = [s for c, s in zip(word, clue) if c == letter]
+            # compare() hands out yellows left to right, so a black copy
+            # followed by a yellow one can never happen.
+            loose = [s for s in signals if s != 2]
+            if loose != sorted(loose, reverse=True):
+                return self.empty.copy()
+            found = sum(1 for s in signals if s > 0)
+            if 0 in loose:
+                result &= self.exact(letter, found)
+            else:
+                result &= self.minimum(letter, found)
+        for i, (letter, s) in enumerate(zip(word, clue)):
+            if s == 2:
+                result &= self.position(letter, i)
+            else:
+                result &= ~self.position(letter, i)
+        return result
+
+
+def clue_index(wordlist: WordleList) -> ClueIndex:
+    """The ClueIndex over the possible answers of wordlist, built once."""
+    if wordlist._index is None:
+        wordlist._index = ClueIndex(wordlist.letters[wordlist.answers])
+    return wordlist._index
@@ -3,6 +3,8 @@ from __future__ import annotations
 import random
 from typing import Literal, Protocol
 
+import numpy as np
+
 from wordle.wordle import Clue, HardModeFilter, Wordle, WordleList
 
 
@@ -16,6 +18,9 @@ class WordleSolver(Protocol):
     def add_clue(self, clue: Clue) -> None:
         ...
 
+    def pop_clue(self) -> Clue:
+        ...
+
     def best(self, n: int) -> list[tuple[Wordle, float]]:
         ...
 
@@ -38,32 +43,36 @@ class PlaySession:
         ans: Wordle | str | None = None,
     ):
         self.masterlist = wordlist
+        self.cum_weights = np.cumsum(wordlist.weights).tolist()
         self.hard_filter = HardModeFilter()
         self.mode = mode
         self.new(ans)
 
     def new(self, ans: Wordle | str | None = None) -> None:
         if ans is not None:
-            if ans not in self.masterlist.words:
+            if ans not in self.masterlist.ids:
                 raise ValueError("Invalid answer")
             self.choice = Wordle(ans)
         else:
             self.choice = random.choices(
-                self.masterlist.words, weights=self.masterlist.weights
+                self.masterlist.words, cum_weights=self.cum_weights
             )[0]
         self.tries = 0
         self.hard_filter.reset()
 
     def guess(self, guess: str | Wordle) -> Clue:
         guess = Wordle(guess)
-        if guess not in self.masterlist.words:
+        if guess not in self.masterlist.ids:
             raise ValueError("Invalid guess")
-        if self.mode == "hard" and (missing := self.hard_filter.test(guess)):
+        if self.mode == "hard" and (broken := self.hard_filter.test(guess)):
+            letters = ", ".join(sorted(broken))
             raise HardModeInvalid(
-                f"Invalid guess for hard mode. Must contain {missing}", missing
+                "Invalid guess for hard mode. Greens must stay in place and "
+                f"revealed letters must be reused: {letters}",
+                broken,
             )
         self.tries += 1
-        clue = Clue.from_compare(guess, self.choice)
+        clue = Clue(guess, self.masterlist.compare(guess, self.choice))
         self.hard_filter.add_clue(clue)
         return clue
 
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Type
+
+import numpy as np
+
+from wordle import core
+from wordle.patterns import content_hash
+from wordle.solvers import PruningWordleList
+from wordle.wordle import Clue, Wordle, WordleList, compare_many
+
+FORMAT_VERSION = 1
+MAX_DEPTH = 32
+
+
+class DecisionTree:
+    """A solver's whole strategy: one guess per state and one child per clue.
+
+    Node 0 is the root. The clues seen after guessing at node i are the sorted
+    codes[offsets[i]:offsets[i + 1]], leading to the same slice of children.
+    The all-green clue ends the game and has no child.
+    """
+
+    def __init__(
+        self,
+        words: np.ndarray,
+        guesses: np.ndarray,
+        points: np.ndarray,
+        offsets: np.ndarray,
+        codes: np.ndarray,
+        children: np.ndarray,
+        hash: str,
+        solver: str,
+        hard: bool,
+    ):
+        self.words = words
+        self.guesses = guesses
+        self.points = points
+        self.offsets = offsets
+        self.codes = codes
+        self.children = children
+        self.hash = hash
+        self.solver = solver
+        self.hard = hard
+
+    def __len__(self) -> int:
+        return len(self.guesses)
+
+    def guess(self, node: int) -> Wordle:
+        return Wordle(str(self.words[self.guesses[node]]))
+
+    def child(self, node: int, code: int) -> int:
+        start, stop = self.offsets[node], self.offsets[node + 1]
+        i = start + np.searchsorted(self.codes[start:stop], code)
+        if i == stop or self.codes[i] != code:
+            raise KeyError(code)
+        return int(self.children[i])
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                version=np.array(FORMAT_VERSION),
+                words=self.words,
+                guesses=self.guesses,
+                points=self.points,
+                offsets=self.offsets,
+                codes=self.codes,
+                children=self.children,
+                hash=np.array(self.hash),
+                solver=np.array(self.solver),
+                hard=np.array(self.hard),
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> DecisionTree:
+        with np.load(path) as data:
+            if int(data["version"]) != FORMAT_VERSION:
+                raise ValueError("Unsupported decision tree format")
+            return cls(
+                words=data["words"],
+                guesses=data["guesses"],
+                points=data["points"],
+                offsets=data["offsets"],
+                codes=data["codes"],
+                children=data["children"],
+                hash=str(data["hash"]),
+                solver=str(data["solver"]),
+                hard=bool(data["hard"]),
+            )
+
+
+def _best_easy(solver: core.WordleSolver) -> tuple[Wordle, float]:
+    return solver.best(1)[0]
+
+
+def _best_hard(solver: core.WordleSolver) -> tuple[Wordle, float]:
+    return solver.besth(1)[0]
+
+
+def compile_tree(
+    wordlist: WordleList,
+    solvertype: Type[core.WordleSolver],
+    hard: bool = False,
+    firstguess: str | None = None,
+) -> DecisionTree:
+    """Play solvertype against every answer at once and record its choices."""
+    solver = solvertype(wordlist)
+    solver.reset()
+    solved = 3 ** len(wordlist.words[0]) - 1
+    best = _best_hard if hard else _best_easy
+    words: dict[str, int] = {}
+    guesses: list[int] = []
+    points: list[float] = []
+    edges: list[list[tuple[int, int]]] = []
+
+    def visit(guess: Wordle, score: float, depth: int) -> int:
+        if depth > MAX_DEPTH:
+            raise ValueError("Solver does not converge")
+        node = len(guesses)
+        guesses.append(words.setdefault(guess, len(words)))
+        points.append(score)
+        edges.append([])
+        candidates = solver.list()
+        codes, counts = np.unique(compare_many(guess, candidates), return_counts=True)
+        for code, count in zip(codes.tolist(), counts.tolist()):
+            if code == solved:
+                continue
+            solver.add_clue(Clue(guess, code))
+            if count == 1:
+                # A sole candidate always scores 0 and is the solver's pick.
+                nextguess, nextscore = solver.list()[0], 0.0
+            else:
+                nextguess, nextscore = best(solver)
+            edges[node].append((code, visit(nextguess, nextscore, depth + 1)))
+            solver.pop_clue()
+        return node
+
+    if firstguess is not None:
+        visit(Wordle(firstguess), 0.0, 0)
+    else:
+        visit(*best(solver), 0)
+    offsets = np.cumsum([0] + [len(e) for e in edges])
+    flat = [edge for e in edges for edge in e]
+    return DecisionTree(
+        words=np.array(list(words)),
+        guesses=np.array(guesses, dtype=np.int32),
+        points=np.array(points),
+        offsets=offsets.astype(np.int32),
+        codes=np.array([code for code, _ in flat], dtype=np.uint32),
+        children=np.array([child for _, child in flat], dtype=np.int32),
+        hash=content_hash(wordlist),
+        solver=solvertype.__name__,
+        hard=hard,
+    )
+
+
+class TreeSolver:
+    """Plays a compiled DecisionTree; best() never scores guesses."""
+
+    def __init__(
+        self,
+        masterlist: list[tuple[str, int]] | list[str] | WordleList,
+        tree: DecisionTree,
+    ):
+        if not isinstance(masterlist, WordleList):
+            masterlist = WordleList(masterlist)
+        if tree.hash != content_hash(masterlist):
+            raise ValueError("Decision tree was compiled for another word list")
+        self.masterlist = masterlist
+        self.tree = tree
+        self._pruner: PruningWordleList | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.clues: list[Clue] = []
+        self.node: int | None = 0
+
+    def _walk(self, node: int | None, clue: Clue) -> int | None:
+        if node is None or clue.word != self.tree.guess(node):
+            return None
+        try:
+            return self.tree.child(node, clue.code)
+        except KeyError:
+            return None
+
+    def add_clue(self, clue: Clue) -> None:
+        if len(clue) != len(clue.word):
+            raise ValueError("Signal length invalid")
+        self.clues.append(clue)
+        self.node = self._walk(self.node, clue)
+
+    def pop_clue(self) -> Clue:
+        if not self.clues:
+            raise IndexError("No clue to pop")
+        clue = self.clues.pop()
+        self.node = 0
+        for old in self.clues:
+            self.node = self._walk(self.node, old)
+        return clue
+
+    def _best(self, hard: bool) -> list[tuple[Wordle, float]]:
+        if hard and not self.tree.hard:
+            raise ValueError("Decision tree was compiled for easy mode")
+        if self.node is None:
+            raise ValueError("Clues left the decision tree")
+        return [(self.tree.guess(self.node), float(self.tree.points[self.node]))]
+
+    def best(self, n: int) -> list[tuple[Wordle, float]]:
+        return self._best(False)
+
+    def besth(self, n: int) -> list[tuple[Wordle, float]]:
+        return self._best(True)
+
+    def list(self) -> list[Wordle]:
+        # Only pruned on request; walking the tree needs no candidate list.
+        if self._pruner is None:
+            self._pruner = PruningWordleList(self.masterlist)
+        self._pruner.reset()
+        for clue in self.clues:
+            self._pruner.add_clue(clue)
+        return self._pruner.list()
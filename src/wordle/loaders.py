@@ -1,7 +1,18 @@
+import bz2
+import functools
+import gzip
+import hashlib
 import importlib.resources as pkg_resources
+import lzma
+import os
 import re
+import shutil
 from pathlib import Path
+from typing import IO, Callable
 
+import numpy as np
+
+from wordle.patterns import cache_dir
 from wordle.wordle import WordleList
 
 PACKAGE = "wordle"
@@ -16,42 +27,87 @@ WORDLISTS = {
         "commons": "bnccoca10000-grouped.txt",
     },
 }
+COMPILED_FORMAT = 1
+FORMATS = {"word": r"^\w+$", "word weight": r"^\w+ \d+$", "weight word": r"^\d+ \w+$"}
+OPENERS: dict[str, Callable[..., IO[str]]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+SHARDS: dict[Path, dict[int, WordleList]] = {}
 
 
 def load_wordlelist(
-    length: int | None = 5, filename: str | Path | None = None
+    length: int | None = 5,
+    filename: str | Path | None = None,
+    format: str | None = None,
 ) -> WordleList:
+    if length is not None and filename is None:
+        compiled = load_compiled("official" if length == 5 else "custom", length)
+        if compiled is not None:
+            return compiled
     if length == 5 and filename is None:
         wordlist = load_resource("official")
     elif filename is None:
         wordlist = load_resource("custom")
     else:
-        wordlist = load_file(filename)
+        wordlist = load_file(filename, length, format)
     wordlist = filter_length(wordlist, length)
     wordlist = dedup(wordlist)
+    if not wordlist:
+        raise ValueError(f"No words of length {length}")
     return WordleList(wordlist)
 
 
-def load_file(filename: str | Path) -> list[tuple[str, int]]:
-    data = open(filename).read().split("\n")
-    if re.match(r"^\w+$", data[0]):
-        wordlist = [(word, 1) for word in data if word.isalpha()]
-    elif re.match(r"^\w+ \d+$", data[0]):
-        wordlist = [
-            (word.split(" ")[0], int(word.split(" ")[1]))
-            for word in data
-            if word != "" and word.split(" ")[0].isalpha()
-        ]
-    elif re.match(r"^\d+ \w+$", data[0]):
-        wordlist = [
-            (word.split(" ")[1], int(word.split(" ")[0]))
-            for word in data
-            if word != "" and word.split(" ")[1].isalpha()
-        ]
-        pass
+def open_text(filename: str | Path) -> IO[str]:
+    """Open a word list for reading, decompressing by file extension."""
+    opener = OPENERS.get(Path(filename).suffix, open)
+    return opener(filename, "rt")
+
+
+def detect_format(line: str) -> str:
+    for format, pattern in FORMATS.items():
+        if re.match(pattern, line):
+            return format
+    raise ValueError("Invalid file format")
+
+
+def parse_line(line: str, format: str) -> tuple[str, int] | None:
+    if format == "word":
+        return (line, 1) if line.isalpha() else None
+    if line == "":
+        return None
+    first, second = line.split(" ")[:2]
+    if format == "word weight":
+        word, weight = first, second
     else:
+        word, weight = second, first
+    return (word, int(weight)) if word.isalpha() else None
+
+
+def load_file(
+    filename: str | Path, length: int | None = None, format: str | None = None
+) -> list[tuple[str, int]]:
+    """Stream a word list, keeping only words of length and summing duplicates.
+
+    format is one of FORMATS and is guessed from the first line if not given.
+    """
+    if format is not None and format not in FORMATS:
+        raise ValueError("Invalid file format")
+    wordlist: dict[str, int] = {}
+    with open_text(filename) as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if format is None:
+                format = detect_format(line)
+            pair = parse_line(line, format)
+            if pair is None or (length is not None and len(pair[0]) != length):
+                continue
+            word, weight = pair
+            wordlist[word] = wordlist.get(word, 0) + weight
+    if format is None:
         raise ValueError("Invalid file format")
-    return wordlist
+    return list(wordlist.items())
 
 
 def load_resource(source: str) -> list[tuple[str, int]]:
@@ -64,6 +120,64 @@ def load_resource(source: str) -> list[tuple[str, int]]:
     return [(word, 0) for word in alls] + [(word, 1) for word in commons]
 
 
+@functools.lru_cache(maxsize=None)
+def resource_hash(source: str) -> str:
+    h = hashlib.sha1(f"wordlist-v{COMPILED_FORMAT}\n".encode())
+    for kind in ("alls", "commons"):
+        h.update(pkg_resources.read_binary(RESOURSES, WORDLISTS[source][kind]))
+    return h.hexdigest()
+
+
+def compiled_path(source: str) -> Path:
+    return cache_dir() / "wordlists" / f"{source}-{resource_hash(source)}"
+
+
+def compile_resource(source: str, path: Path) -> dict[int, WordleList]:
+    """Store a resource as sorted word and weight arrays, one pair per length.
+
+    The lists are returned too, for when the cache cannot be written.
+    """
+    bylength: dict[int, list[tuple[str, int]]] = {}
+    for word, weight in dedup(load_resource(source)):
+        if word.isascii() and word.isalpha():
+            bylength.setdefault(len(word), []).append((word, weight))
+    wordlists = {length: WordleList(words) for length, words in bylength.items()}
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.mkdir(parents=True, exist_ok=True)
+        for length, wordlist in wordlists.items():
+            np.save(tmp / f"words-{length}.npy", wordlist.chars.astype(f"S{length}"))
+            np.save(tmp / f"weights-{length}.npy", wordlist.weights.astype(np.int64))
+        os.replace(tmp, path)
+    except OSError:
+        # Another process got there first, or the cache is not writable.
+        shutil.rmtree(tmp, ignore_errors=True)
+    return wordlists
+
+
+def load_compiled(source: str, length: int) -> WordleList | None:
+    """One length of a resource from its compiled form, compiling it if needed.
+
+    Each length is a separate shard, read on first use and then kept in SHARDS.
+    """
+    path = compiled_path(source)
+    shards = SHARDS.setdefault(path, {})
+    if length not in shards:
+        if not path.is_dir():
+            wordlists = compile_resource(source, path)
+            if not path.is_dir():
+                # Keep every length in memory rather than parse the text again.
+                shards.update(wordlists)
+                return shards.get(length)
+        try:
+            words = np.load(path / f"words-{length}.npy", mmap_mode="r")
+            weights = np.load(path / f"weights-{length}.npy", mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        shards[length] = WordleList.from_arrays(words, weights)
+    return shards[length]
+
+
 def filter_length(
     wordlist: list[tuple[str, int]], length: int | None
 ) -> list[tuple[str, int]]:
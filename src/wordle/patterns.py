@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+from wordle.wordle import WordleList, code_dtype, compare_codes
+
+CACHE_ENV = "WORDLE_CACHE_DIR"
+FORMAT_VERSION = 1
+CHUNK_CELLS = 1 << 20
+
+
+def cache_dir() -> Path:
+    if CACHE_ENV in os.environ:
+        return Path(os.environ[CACHE_ENV])
+    base = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(base) / "wordle"
+
+
+def content_hash(wordlist: WordleList) -> str:
+    h = hashlib.sha1(f"patterns-v{FORMAT_VERSION}\n".encode())
+    for word, weight in wordlist:
+        h.update(f"{word} {weight}\n".encode())
+    return h.hexdigest()
+
+
+def blacks(codes: np.ndarray, length: int) -> np.ndarray:
+    codes = np.asarray(codes, dtype=np.int64)
+    return sum((codes // 3**i) % 3 == 0 for i in range(length))
+
+
+class PatternMatrix:
+    def __init__(self, wordlist: WordleList, cache: bool = True):
+        self.length = wordlist.letters.shape[1]
+        self.rows = wordlist.ids
+        self.answers = wordlist.answers
+        self.hash = content_hash(wordlist)
+        matrix = self.load() if cache else None
+        if matrix is None:
+            matrix = self.compute(wordlist)
+            if cache:
+                self.save(matrix)
+        self.matrix: np.ndarray = matrix
+
+    @property
+    def path(self) -> Path:
+        return cache_dir() / f"patterns-{self.hash}.npy"
+
+    def compute(self, wordlist: WordleList) -> np.ndarray:
+        letters = wordlist.letters
+        keys = letters[self.answers]
+        matrix = np.empty((len(letters), len(keys)), dtype=code_dtype(self.length))
+        step = max(1, CHUNK_CELLS // max(1, len(keys)))
+        for start in range(0, len(letters), step):
+            stop = start + step
+            matrix[start:stop] = compare_codes(letters[start:stop], keys)
+        return matrix
+
+    def load(self) -> np.ndarray | None:
+        try:
+            matrix = np.load(self.path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if matrix.shape != (len(self.rows), len(self.answers)):
+            return None
+        return matrix
+
+    def save(self, matrix: np.ndarray) -> None:
+        path = self.path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, matrix)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def row(self, word: str) -> np.ndarray | None:
+        if word not in self.rows:
+            return None
+        return self.matrix[self.rows[word]]
+
+
+def pattern_matrix(wordlist: WordleList) -> PatternMatrix:
+    if wordlist._patterns is None:
+        wordlist._patterns = PatternMatrix(wordlist)
+    return wordlist._patterns
@@ -1,15 +1,23 @@
 from __future__ import absolute_import
 
 import random
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Literal
 
 from wordle import core, loaders
-from wordle.solvers import solversdict
-from wordle.wordle import Wordle, compare
+from wordle.constraints import clue_index
+from wordle.decisiontree import DecisionTree, TreeSolver
+from wordle.patterns import pattern_matrix
+from wordle.solvers import PruningWordleList, solversdict
+from wordle.wordle import Clue, Wordle, WordleList, compare, decode
 
 signal_emoji = "⬛🟨🟩"
 DEFAULT_LIST_SIZE = 20
+# Commands answered without waiting for the word list to load.
+CHEAP_COMMANDS = {"quit", "help", "compare", "difficulty", "length", "wordfile"}
+
+Sessions = tuple[WordleList, core.WordleSolver, core.PlaySession]
 
 prompt = {
     "play": "P>",
@@ -57,6 +65,7 @@ class REPLoop:
         wordfile: str | Path | None = None,
         solver: str = "default",
         autorun: bool = True,
+        tree: str | Path | None = None,
     ):
         if mode not in ("solve", "play"):
             raise ValueError("Invalid mode")
@@ -68,16 +77,93 @@ class REPLoop:
         self.length = length
         self.wordfile = wordfile
         self.solver = solversdict[solver]
-
+        self.tree = DecisionTree.load(tree) if tree is not None else None
+
+        self.msg: str | None = None
+        self._warmer = ThreadPoolExecutor(max_workers=1)
+        self._loading: Future[Sessions] | None = None
+        self._loaded: Sessions | None = None
+        # The first load, kept to fall back on if a reload replacing it fails.
+        self._initial: Future[Sessions] | None = None
+        self._settings = (self.length, self.wordfile)
         self.load_wordlist()
 
         if autorun:
             self.run()
 
     def load_wordlist(self) -> None:
-        self.wordlist = loaders.load_wordlelist(self.length, self.wordfile)
-        self.solve_session = self.solver(self.wordlist)
-        self.play_session = core.PlaySession(self.wordlist, mode=self.difficulty)
+        """Load the word list and build the solvers on the warm-up thread."""
+        if self._loading is not None:
+            if self._loaded is None and self._initial is None:
+                self._initial = self._loading
+            else:
+                self._loading.cancel()
+        self._loading = self._warmer.submit(
+            self.build, self.length, self.wordfile, self.difficulty
+        )
+
+    def build(
+        self,
+        length: int | None,
+        wordfile: str | Path | None,
+        difficulty: Literal["easy", "hard"],
+    ) -> Sessions:
+        wordlist = loaders.load_wordlelist(length, wordfile)
+        solve_session: core.WordleSolver
+        if self.tree is not None:
+            solve_session = TreeSolver(wordlist, self.tree)
+        else:
+            solve_session = self.solver(wordlist)
+        if isinstance(solve_session, PruningWordleList):
+            # Tables the first guess and best would otherwise build.
+            pattern_matrix(wordlist)
+            clue_index(wordlist)
+        play_session = core.PlaySession(wordlist, mode=difficulty)
+        return wordlist, solve_session, play_session
+
+    @property
+    def warming(self) -> bool:
+        return self._loading is not None and not self._loading.done()
+
+    def wait(self) -> bool:
+        """Finish a pending load. On failure keep the previous list and say why."""
+        if self._loading is None:
+            return True
+        loading, self._loading = self._loading, None
+        initial, self._initial = self._initial, None
+        try:
+            self._loaded = loading.result()
+        except (ValueError, OSError) as e:
+            if self._loaded is None:
+                if initial is None:
+                    raise
+                self._loaded = initial.result()
+            self.length, self.wordfile = self._settings
+            self._loaded[2].mode = self.difficulty
+            self.msg = f"{e}. Kept the previous word list."
+            return False
+        if initial is not None:
+            initial.cancel()
+        self._settings = (self.length, self.wordfile)
+        self._loaded[2].mode = self.difficulty
+        return True
+
+    def sessions(self) -> Sessions:
+        self.wait()
+        assert self._loaded is not None
+        return self._loaded
+
+    @property
+    def wordlist(self) -> WordleList:
+        return self.sessions()[0]
+
+    @property
+    def solve_session(self) -> core.WordleSolver:
+        return self.sessions()[1]
+
+    @property
+    def play_session(self) -> core.PlaySession:
+        return self.sessions()[2]
 
     def new(self) -> None:
         if self.mode == "play":
@@ -89,10 +175,13 @@ class REPLoop:
             self.msg = None
             return
         cmd = self.tokens[0]
+        if cmd not in CHEAP_COMMANDS and not self.wait():
+            return
 
         if cmd == "quit":
             self.quit = True
             self.msg = None
+            self._warmer.shutdown(wait=False, cancel_futures=True)
             return
 
         if cmd == "length":
@@ -100,15 +189,13 @@ class REPLoop:
                 self.msg = "Missing length"
                 return
             try:
-                self.length = int(self.tokens[1])
+                length = int(self.tokens[1])
             except ValueError:
                 self.msg = "Length should be an integer"
                 return
-            if self.length == 0:
-                self.length = None
-
-            self.msg = f"Length set to {self.length}. There are {len(self.wordlist)}\
-words. Game reset."
+            self.length = length or None
+            self.load_wordlist()
+            self.msg = f"Length set to {self.length}. Loading words. Game reset."
             return
 
         if cmd == "wordfile":
@@ -120,14 +207,8 @@ words. Game reset."
                 self.msg = "File not found"
                 return
             self.wordfile = wordfile
-            try:
-                self.load_wordlist()
-            except ValueError as e:
-                self.msg = str(e)
-                return
-
-            self.msg = f"Read words from {self.wordfile}. There are {len(self.wordlist)}\
-words. Game reset."
+            self.load_wordlist()
+            self.msg = f"Reading words from {self.wordfile}. Game reset."
             return
 
         if cmd == "new":
@@ -149,7 +230,7 @@ words. Game reset."
                 except ValueError:
                     self.msg = "Invalid guess"
                     return
-                self.solve_session.add_clue(core.Clue(guess, signal))
+                self.solve_session.add_clue(Clue(guess, signal))
                 self.msg = f"{guess}: {signaltext(signal)}"
                 return
             if self.mode == "solve":
@@ -157,10 +238,11 @@ words. Game reset."
                 if len(self.tokens) < 3:
                     self.msg = "Missing signal"
                     return
+                insignal: list[int]
                 try:
                     try:
                         key = Wordle(self.tokens[2])
-                        insignal = compare(guess, key)
+                        insignal = decode(compare(guess, key), len(guess))
                     except ValueError:
                         insignal = [
                             {"0": 0, "1": 1, "2": 2}[s]
@@ -172,7 +254,7 @@ words. Game reset."
                 if len(insignal) != len(guess):
                     self.msg = "Signal has wrong length"
                     return
-                self.solve_session.add_clue(core.Clue(guess, insignal))
+                self.solve_session.add_clue(Clue(guess, insignal))
                 self.msg = None
                 return
 
@@ -195,10 +277,14 @@ words. Game reset."
                     return
             else:
                 n = DEFAULT_LIST_SIZE
-            if cmd == "best":
-                best = self.solve_session.best(n)
-            else:
-                best = self.solve_session.besth(n)
+            try:
+                if cmd == "best":
+                    best = self.solve_session.best(n)
+                else:
+                    best = self.solve_session.besth(n)
+            except ValueError as e:
+                self.msg = str(e)
+                return
             self.msg = "\n".join([f"{w} ({p:.2f})" for w, p in best])
             return
 
@@ -214,7 +300,7 @@ words. Game reset."
             if len(w1) != len(w2):
                 self.msg = "Words must be the same length"
                 return
-            self.msg = signaltext(compare(w1, w2))
+            self.msg = signaltext(Clue.from_compare(w1, w2))
             return
 
         if cmd == "list":
@@ -285,8 +371,9 @@ words. Game reset."
             except KeyError:
                 self.msg = "Difficulty must be easy or hard"
                 return
-            if self.mode == "play":
-                self.play_session.mode = self.difficulty
+            if self.mode == "play" and self._loaded is not None:
+                # A pending load picks the difficulty up when it completes.
+                self._loaded[2].mode = self.difficulty
             self.msg = f"Difficulty set to {self.difficulty}."
             return
 
@@ -297,7 +384,8 @@ words. Game reset."
 
     def read(self) -> None:
         try:
-            line = input(f"{self.prompt} ").strip()
+            status = "(warming)" if self.warming else ""
+            line = input(f"{self.prompt[:-1]}{status}{self.prompt[-1]} ").strip()
         except EOFError:
             print()
             line = "quit"
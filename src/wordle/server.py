@@ -0,0 +1,409 @@
+"""HTTP/JSON front end hosting many solve and play sessions over one word list.
+
+POST   /sessions                {"mode": "solve"|"play", "difficulty", "answer"}
+GET    /sessions/<id>           state of the session
+DELETE /sessions/<id>
+POST   /sessions/<id>/guess     {"word", "clue"}, clue only in solve mode
+POST   /sessions/<id>/undo      drop the last clue, solve mode only
+GET    /sessions/<id>/best?n=&hard=
+GET    /sessions/<id>/list?n=
+GET    /sessions/<id>/answer    play mode only
+GET    /health
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import secrets
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal, Type
+from urllib.parse import parse_qs, urlsplit
+
+from wordle import loaders
+from wordle.constraints import clue_index
+from wordle.core import HardModeInvalid, PlaySession
+from wordle.patterns import pattern_matrix
+from wordle.solvers import StatisticalSolver, solversdict
+from wordle.wordle import Clue, Wordle, WordleList
+
+DEFAULT_IDLE = 600.0
+DEFAULT_LIST_SIZE = 20
+MAX_BODY = 1 << 16
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+Payload = dict[str, Any]
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Session:
+    """One game: a solver over the shared word list, and a PlaySession to play."""
+
+    def __init__(
+        self,
+        wordlist: WordleList,
+        solvertype: Type[StatisticalSolver],
+        mode: Literal["solve", "play"],
+        difficulty: Literal["easy", "hard"],
+        answer: str | None = None,
+    ):
+        self.mode = mode
+        self.difficulty = difficulty
+        self.solver = solvertype(wordlist)
+        self.play = (
+            PlaySession(wordlist, difficulty, answer) if mode == "play" else None
+        )
+        self.lock = asyncio.Lock()
+        self.touch()
+
+    def touch(self) -> None:
+        self.used = time.monotonic()
+
+    def state(self) -> Payload:
+        state: Payload = {
+            "mode": self.mode,
+            "difficulty": self.difficulty,
+            "clues": [{"word": c.word, "clue": list(c)} for c in self.solver.clues],
+            "candidates": len(self.solver.keys),
+        }
+        if self.play is not None:
+            state["tries"] = self.play.tries
+        return state
+
+
+class WordleServer:
+    """Sessions keyed by ID; best and besth run on a thread pool."""
+
+    def __init__(
+        self,
+        wordlist: WordleList,
+        solvertype: Type[StatisticalSolver] = StatisticalSolver,
+        idle: float = DEFAULT_IDLE,
+        workers: int | None = None,
+    ):
+        self.wordlist = wordlist
+        self.solvertype = solvertype
+        self.idle = idle
+        self.sessions: dict[str, Session] = {}
+        self.executor = ThreadPoolExecutor(workers)
+        self._server: asyncio.AbstractServer | None = None
+        self._sweeper: asyncio.Task[None] | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> tuple[str, int]:
+        """Build the shared tables, then listen. Returns the bound address."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.warm)
+        self._server = await asyncio.start_server(self.handle, host, port)
+        self._sweeper = asyncio.create_task(self.sweep())
+        return self._server.sockets[0].getsockname()[:2]
+
+    def warm(self) -> None:
+        pattern_matrix(self.wordlist)
+        clue_index(self.wordlist)
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def sweep(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self.idle / 4))
+            self.evict()
+
+    def evict(self, now: float | None = None) -> int:
+        """Drop sessions idle for longer than self.idle seconds."""
+        now = time.monotonic() if now is None else now
+        stale = [
+            sid
+            for sid, session in self.sessions.items()
+            if now - session.used > self.idle and not session.lock.locked()
+        ]
+        for sid in stale:
+            self.sessions.pop(sid, None)
+        return len(stale)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception:
+                    traceback.print_exc()
+                    status, payload = 500, {"error": "Internal server error"}
+                keep = headers.get("connection", "").lower() != "close"
+                writer.write(response(status, payload, keep))
+                await writer.drain()
+                if not keep:
+                    break
+        except HTTPError as e:
+            writer.write(response(e.status, {"error": str(e)}, False))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> tuple[int, Any]:
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if parts == ["health"]:
+            allow(method, "GET")
+            return 200, {"sessions": len(self.sessions), "words": len(self.wordlist)}
+        if parts == ["sessions"]:
+            allow(method, "POST")
+            return 201, self.create(parse_json(body))
+        if len(parts) < 2 or parts[0] != "sessions":
+            raise HTTPError(404, "Not found")
+        sid, action = parts[1], parts[2] if len(parts) > 2 else None
+        session = self.sessions.get(sid)
+        if session is None or len(parts) > 3:
+            raise HTTPError(404, "No such session")
+        session.touch()
+        async with session.lock:
+            try:
+                result = await self.act(session, method, action, query, body)
+            except (ValueError, HardModeInvalid) as e:
+                raise HTTPError(400, str(e.args[0] if e.args else e))
+            finally:
+                session.touch()
+        if action is None and method == "DELETE":
+            self.sessions.pop(sid, None)
+        return 200, result
+
+    def create(self, request: Payload) -> Payload:
+        mode = request.get("mode", "solve")
+        difficulty = request.get("difficulty", "easy")
+        if mode not in ("solve", "play"):
+            raise HTTPError(400, "Invalid mode")
+        if difficulty not in ("easy", "hard"):
+            raise HTTPError(400, "Invalid difficulty")
+        try:
+            session = Session(
+                self.wordlist, self.solvertype, mode, difficulty, request.get("answer")
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        sid = secrets.token_urlsafe(12)
+        self.sessions[sid] = session
+        return {"id": sid, **session.state()}
+
+    async def act(
+        self,
+        session: Session,
+        method: str,
+        action: str | None,
+        query: dict[str, str],
+        body: bytes,
+    ) -> Payload:
+        solver, play = session.solver, session.play
+        if action is None:
+            allow(method, "GET", "DELETE")
+            return session.state()
+        if action == "guess":
+            allow(method, "POST")
+            request = parse_json(body)
+            word = Wordle(str(request.get("word", "")))
+            if play is not None:
+                clue = play.guess(word)
+            else:
+                clue = Clue(word, parse_clue(request.get("clue")))
+            solver.add_clue(clue)
+            return {"clue": list(clue), "solved": clue.solved, **session.state()}
+        if action == "undo":
+            allow(method, "POST")
+            if play is not None:
+                raise ValueError("Cannot use undo in play mode")
+            if not solver.clues:
+                raise ValueError("No clue to undo")
+            solver.pop_clue()
+            return session.state()
+        if action == "best":
+            allow(method, "GET")
+            if play is not None:
+                raise ValueError("Cannot use best in play mode")
+            n = parse_int(query.get("n"), DEFAULT_LIST_SIZE)
+            hard = query.get("hard", "0") not in ("0", "false", "")
+            best = solver.besth if hard or session.difficulty == "hard" else solver.best
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self.executor, best, n)
+            return {"best": [{"word": w, "score": s} for w, s in results]}
+        if action == "list":
+            allow(method, "GET")
+            words = solver.list()
+            n = parse_int(query.get("n"), DEFAULT_LIST_SIZE)
+            return {"count": len(words), "words": words[:n] if n > 0 else words}
+        if action == "answer":
+            allow(method, "GET")
+            if play is None:
+                raise ValueError("Can use answer only in play mode")
+            return {"answer": play.answer()}
+        raise HTTPError(404, "Not found")
+
+
+def allow(method: str, *methods: str) -> None:
+    if method not in methods:
+        raise HTTPError(405, f"Use {' or '.join(methods)}")
+
+
+def parse_json(body: bytes) -> Payload:
+    if not body:
+        return {}
+    try:
+        request = json.loads(body)
+    except ValueError:
+        raise HTTPError(400, "Body must be JSON")
+    if not isinstance(request, dict):
+        raise HTTPError(400, "Body must be a JSON object")
+    return request
+
+
+def parse_clue(clue: object) -> list[int]:
+    """A clue as a list of 0/1/2 or a string of those digits."""
+    if isinstance(clue, str):
+        clue = list(clue)
+    if not isinstance(clue, list):
+        raise ValueError("Missing clue")
+    try:
+        signal = [int(s) for s in clue]
+    except (TypeError, ValueError):
+        raise ValueError("Invalid clue")
+    if any(s not in (0, 1, 2) for s in signal):
+        raise ValueError("Invalid clue")
+    return signal
+
+
+def parse_int(value: str | None, default: int) -> int:
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(400, "Invalid number")
+
+
+async def read_request(
+    reader: asyncio.StreamReader,
+) -> tuple[str, str, dict[str, str], bytes] | None:
+    """One HTTP/1.1 request, or None once the client closes the connection."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers: dict[str, str] = {}
+    while (line := await reader.readline()).strip():
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = parse_int(headers.get("content-length"), 0)
+    if length > MAX_BODY:
+        raise HTTPError(413, "Body too large")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), target, headers, body
+
+
+def response(status: int, payload: Any, keep: bool = True) -> bytes:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep else 'close'}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+async def serve(
+    wordlist: WordleList,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    solvertype: Type[StatisticalSolver] = StatisticalSolver,
+    idle: float = DEFAULT_IDLE,
+    workers: int | None = None,
+) -> None:
+    server = WordleServer(wordlist, solvertype, idle, workers)
+    host, port = await server.start(host, port)
+    print(f"Serving on http://{host}:{port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def parse(args: list[str] | None = None) -> Any:
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog="wordle serve", description="Wordle JSON server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8000)
+    parser.add_argument("-l", "--length", type=int, default=5, metavar="N")
+    parser.add_argument("-w", "--wordfile", default=None, metavar="FILE")
+    parser.add_argument(
+        "-s",
+        "--solver",
+        choices=solversdict.keys(),
+        default="default",
+        metavar="NAME",
+        help=f"Available: {', '.join(solversdict.keys())}",
+    )
+    parser.add_argument(
+        "-i",
+        "--idle",
+        type=float,
+        default=DEFAULT_IDLE,
+        help="Seconds before an unused session is dropped. [default: %(default)s]",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="Threads for best and besth. [default: Python's choice]",
+    )
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> None:
+    options = parse(args)
+    wordlist = loaders.load_wordlelist(options.length, options.wordfile)
+    try:
+        asyncio.run(
+            serve(
+                wordlist,
+                options.host,
+                options.port,
+                solversdict[options.solver],  # type: ignore
+                options.idle,
+                options.workers,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
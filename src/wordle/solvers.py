@@ -1,97 +1,313 @@
-import math
-from typing import Type
+import heapq
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterator, Type
 
-from wordle import core
+import numpy as np
+
+from wordle import bitset, core
+from wordle.constraints import ClueIndex, clue_index
+from wordle.patterns import CHUNK_CELLS, PatternMatrix, blacks, pattern_matrix
 from wordle.wordle import (
     Clue,
     HardModeFilter,
     WeightedWordle,
     Wordle,
     WordleList,
-    compare,
+    compare_codes,
+    letter_array,
 )
 
+TOP_CHUNK = 1024
+
 
 class PruningWordleList:
     def __init__(self, masterlist: list[tuple[str, int]] | list[str] | WordleList):
         if not isinstance(masterlist, WordleList):
             masterlist = WordleList(masterlist)
         self.masterlist = masterlist
-        self.hmf = HardModeFilter()
+        self.hmf = HardModeFilter(masterlist)
+        self.size = len(masterlist.answers)
+        self.answer_weights = masterlist.answer_weights
         self.reset()
 
+    @property
+    def patterns(self) -> PatternMatrix:
+        return pattern_matrix(self.masterlist)
+
+    @property
+    def index(self) -> ClueIndex:
+        return clue_index(self.masterlist)
+
     def reset(self) -> None:
-        self.wordlelist = [word for word in self.masterlist if word.weight > 0]
+        self.clues: list[Clue] = []
+        self.history: list[np.ndarray] = []
         self.hmf.reset()
+        self._set_state(bitset.full(self.size), np.arange(self.size))
+
+    def _set_state(self, state: np.ndarray, keys: np.ndarray | None = None) -> None:
+        self.state = state
+        self._keys = keys
+        self._wordlelist: list[WeightedWordle] | None = None
+
+    @property
+    def keys(self) -> np.ndarray:
+        """Positions of the remaining candidates in masterlist.answers."""
+        if self._keys is None:
+            self._keys = bitset.to_indices(self.state, self.size)
+        return self._keys
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self.answer_weights[self.keys]
+
+    @property
+    def wordlelist(self) -> list[WeightedWordle]:
+        if self._wordlelist is None:
+            ids = self.masterlist.answers[self.keys]
+            self._wordlelist = [self.masterlist[i] for i in ids]
+        return self._wordlelist
+
+    def codes_block(
+        self, words: list[Wordle], rows: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Clue codes of every word against every candidate, as a 2-D array.
+
+        rows are the words' IDs in masterlist, if the caller already has them.
+        """
+        patterns = self.patterns
+        if rows is None:
+            rows = self.masterlist.lookup(words)
+        block = patterns.matrix[rows]
+        if len(self.keys) < block.shape[1]:
+            block = block[:, self.keys]
+        missing = np.flatnonzero(rows < 0)
+        if len(missing):
+            keys = self.masterlist.letters[patterns.answers[self.keys]]
+            guesses = letter_array([words[i] for i in missing])
+            if guesses.shape[1] != patterns.length:
+                raise ValueError("Length mismatch")
+            block[missing] = compare_codes(guesses, keys)
+        return block
+
+    def _load_keys(self, keys: np.ndarray) -> None:
+        self._set_state(bitset.from_indices(keys, self.size), keys)
 
     def add_clue(self, clue: Clue) -> None:
         word = clue.word
         if len(clue) != len(word):
             raise ValueError("Signal length invalid")
-        self.wordlelist = [
-            key for key in self.wordlelist if compare(word, key.word) == clue
-        ]
+        self.history.append(self.state)
+        self.clues.append(clue)
+        self._set_state(self.state & self.index.match(clue))
         self.hmf.add_clue(clue)
 
+    def pop_clue(self) -> Clue:
+        """Undo the last add_clue() and return its clue."""
+        if not self.clues:
+            raise IndexError("No clue to pop")
+        clue = self.clues.pop()
+        self._set_state(self.history.pop())
+        self.hmf.pop_clue()
+        return clue
+
+    def rewind(self, k: int = 1) -> list[Clue]:
+        """Undo the last k clues, returning them in the order they were added."""
+        if not 0 <= k <= len(self.clues):
+            raise IndexError("Cannot rewind past the start")
+        popped = [self.pop_clue() for _ in range(k)]
+        return popped[::-1]
+
     def list(self) -> list[Wordle]:
         return [word.word for word in self.wordlelist]
 
 
 class StatisticalSolver(PruningWordleList):
+    def __init__(
+        self,
+        masterlist: list[tuple[str, int]] | list[str] | WordleList,
+        workers: int = 1,
+        chunksize: int | None = None,
+    ):
+        """workers > 1 shards best()/besth() over a pool of that many processes."""
+        super().__init__(masterlist)
+        self.workers = workers
+        self.chunksize = chunksize
+        self._pool: Executor | None = None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
     def score(self, word: Wordle, hard: bool = False) -> float:
-        if not isinstance(word, Wordle):
-            word = Wordle(word)
-        boxes: dict[tuple[int, ...], int] = {}
-        for key in self.wordlelist:
-            if key.weight == 0:
-                continue
-            signal = tuple(compare(word, key.word))
-            boxes[signal] = boxes.setdefault(signal, 0) + key.weight
-        s = 0.0
-        numwords = len(self.wordlelist)
-        for signal, n in boxes.items():
-            if n == 0:
-                continue
-            s += self.score_formula(n, numwords, signal.count(0), hard=hard)
-        s = self.post_process_score(s)
-        if word in [w.word for w in self.wordlelist]:
-            s *= (numwords - 1) / numwords
-        return s
+        return float(self.scores([Wordle(word)], hard=hard)[0])
+
+    def scores(self, words: list[Wordle], hard: bool = False) -> np.ndarray:
+        """Scores of all words at once from weighted clue histograms."""
+        return np.concatenate([np.zeros(0), *self.iter_scores(words, hard=hard)])
+
+    def iter_scores(
+        self, words: list[Wordle], hard: bool = False, step: int | None = None
+    ) -> Iterator[np.ndarray]:
+        """Scores of words in consecutive chunks, computed as they are consumed."""
+        numwords = len(self.keys)
+        weights = self.weights
+        uniform = bool((weights == 1).all())
+        length = self.patterns.length
+        ncodes = 3**length
+        dense = ncodes <= 4 * numwords
+        if dense:
+            blacktable = blacks(np.arange(ncodes), length)
+        candidate = np.zeros(len(self.masterlist) + 1, dtype=bool)
+        candidate[self.patterns.answers[self.keys]] = True
+        if step is None:
+            step = max(1, CHUNK_CELLS // max(1, numwords))
+        for start in range(0, len(words), step):
+            chunk = words[start : start + step]  # noqa: E203
+            ids = self.masterlist.lookup(chunk)
+            block = self.codes_block(chunk, ids)
+            rows = len(block)
+            # One histogram over (row, code) cells covers the whole block.
+            flat = block + np.arange(0, rows * ncodes, ncodes, dtype=np.int64)[:, None]
+            tiled = None if uniform else np.tile(weights, rows)
+            if dense:
+                boxes = np.bincount(flat.ravel(), tiled, minlength=rows * ncodes)
+                cells = np.flatnonzero(boxes)
+                n = boxes[cells].astype(np.float64)
+                black = blacktable[cells % ncodes]
+            else:
+                cells, inverse = np.unique(flat, return_inverse=True)
+                n = np.bincount(inverse.ravel(), tiled).astype(np.float64)
+                cells, n = cells[n > 0], n[n > 0]
+                black = blacks(cells % ncodes, length)
+            terms = self.score_formula(n, numwords, black, hard=hard)
+            s: np.ndarray = np.bincount(cells // ncodes, terms, minlength=rows)
+            s = self.post_process_score(s)
+            if numwords > 0:
+                # ID -1 lands on the spare last slot, which is never a candidate.
+                s[candidate[ids]] *= (numwords - 1) / numwords
+            yield s
 
     @classmethod
-    def post_process_score(cls, s: float) -> float:
+    def post_process_score(cls, s: np.ndarray) -> np.ndarray:
         return s
 
     @classmethod
     def score_formula(
-        cls, n: float, numwords: float, blacks: int, hard: bool = False
-    ) -> float:
+        cls, n: np.ndarray, numwords: float, blacks: np.ndarray, hard: bool = False
+    ) -> np.ndarray:
         return n * n
 
     def compute(
         self, wordles: list[Wordle], hard: bool = False
     ) -> list[tuple[float, Wordle]]:
-        scores = {word: self.score(word, hard=hard) for word in wordles}
-        ss = [(s, w) for w, s in scores.items()]
+        wordles = list(dict.fromkeys(wordles))
+        ss = list(zip(self.scores(wordles, hard=hard).tolist(), wordles))
         ss.sort()
         return ss
 
-    def _best(
-        self, n: int, wordles: list[WeightedWordle], hardmode: bool = False
-    ) -> list[tuple[Wordle, float]]:
-        testwords = [word.word for word in wordles]
-        if hardmode:
-            testwords = list(self.hmf.filter(testwords))
-        bestlist = self.compute(testwords, hard=hardmode)
+    def score_bounds(self, words: list[Wordle], hard: bool = False) -> np.ndarray:
+        """Lower bounds on scores, from the all-black bucket alone.
+
+        Every solver's bucket terms are non-negative and grow with the bucket
+        weight. Candidates sharing no letter with a guess score all blacks, so
+        that bucket weighs at least the total minus the weight of candidates
+        holding each letter of the guess.
+        """
+        numwords = len(self.keys)
+        if numwords == 0:
+            return np.full(len(words), -np.inf)
+        length = self.patterns.length
+        weights = self.weights
+        keys = self.masterlist.letters[self.patterns.answers[self.keys]]
+        ids = self.masterlist.lookup(words)
+        guesses = self.masterlist.letters[ids].astype(np.uint32)
+        missing = np.flatnonzero(ids < 0)
+        if len(missing):
+            guesses[missing] = letter_array([words[i] for i in missing])
+        alphabet, dense = np.unique(keys, return_inverse=True)
+        present = np.zeros((len(keys), len(alphabet) + 1), dtype=bool)
+        present[np.arange(len(keys))[:, None], dense.reshape(keys.shape)] = True
+        letterweight = weights @ present
+        # Guess letters absent from every candidate map to the spare last slot.
+        index = np.searchsorted(alphabet, guesses)
+        index[alphabet[np.minimum(index, len(alphabet) - 1)] != guesses] = len(alphabet)
+        allblack = np.full(len(words), weights.sum())
+        for i in range(length):
+            first = ~(index[:, :i] == index[:, i, None]).any(axis=1)
+            allblack -= letterweight[index[:, i]] * first
+        bounds = np.zeros(len(words))
+        some = allblack >= 1
+        bounds[some] = self.score_formula(
+            allblack[some], numwords, np.full(some.sum(), length), hard=hard
+        )
+        return self.post_process_score(bounds) * ((numwords - 1) / numwords)
+
+    def compute_top(
+        self, wordles: list[Wordle], n: int, hard: bool = False
+    ) -> list[tuple[float, Wordle]]:
+        """The n best of compute(), skipping guesses whose bound cannot make it."""
+        wordles = list(dict.fromkeys(wordles))
+        bounds = self.score_bounds(wordles, hard=hard)
+        order = np.argsort(bounds, kind="stable")
+        bounds, wordles = bounds[order], [wordles[i] for i in order]
+        step = max(n, min(TOP_CHUNK, CHUNK_CELLS // max(1, len(self.keys))))
+        bestlist: list[tuple[float, Wordle]] = []
+        chunks = self.iter_scores(wordles, hard=hard, step=step)
+        for start, scores in zip(range(0, len(wordles), step), chunks):
+            words = wordles[start : start + step]  # noqa: E203
+            bestlist = heapq.nsmallest(n, bestlist + list(zip(scores.tolist(), words)))
+            stop = start + step
+            if stop < len(wordles) and len(bestlist) == n:
+                # Bounds are sorted, so no later guess can beat the n-th best.
+                if bounds[stop] > bestlist[-1][0]:
+                    break
+        return bestlist
+
+    def _best(self, n: int, hardmode: bool = False) -> list[tuple[Wordle, float]]:
+        words = self.masterlist.words
+        testwords = list(words.select(self.hmf.legal) if hardmode else words)
+        if self.workers > 1:
+            bestlist = self.compute_parallel(testwords, n, hard=hardmode)
+        elif 0 < n < len(testwords):
+            bestlist = self.compute_top(testwords, n, hard=hardmode)
+        else:
+            bestlist = self.compute(testwords, hard=hardmode)
         if n > 0 and n < len(bestlist):
             bestlist = bestlist[:n]
         return [(w, s) for s, w in bestlist]
 
+    def compute_parallel(
+        self, wordles: list[Wordle], n: int, hard: bool = False
+    ) -> list[tuple[float, Wordle]]:
+        wordles = list(dict.fromkeys(wordles))
+        chunksize = self.chunksize or -(-len(wordles) // (4 * self.workers))
+        if len(wordles) <= chunksize:
+            return self.compute(wordles, hard=hard)
+        if self._pool is None:
+            # Workers load the pattern matrix from the disk cache written here.
+            self.patterns
+            pairs: list[tuple[str, int]] = list(
+                zip(self.masterlist.words, self.masterlist.weights)
+            )
+            self._pool = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker, initargs=(type(self), pairs)
+            )
+        chunks = [
+            wordles[i : i + chunksize]  # noqa: E203
+            for i in range(0, len(wordles), chunksize)
+        ]
+        shards = [
+            self._pool.submit(_compute_shard, self.keys, chunk, n, hard)
+            for chunk in chunks
+        ]
+        return list(heapq.merge(*(shard.result() for shard in shards)))
+
     def besth(self, n: int) -> list[tuple[Wordle, float]]:
-        return self._best(n, self.masterlist, True)
+        return self._best(n, True)
 
     def best(self, n: int) -> list[tuple[Wordle, float]]:
-        return self._best(n, self.masterlist, False)
+        return self._best(n, False)
 
     def guess(self) -> Wordle:
         return self.besth(1)[0][0]
@@ -100,8 +316,8 @@ class StatisticalSolver(PruningWordleList):
 class BlackSolver(StatisticalSolver):
     @classmethod
     def score_formula(
-        cls, n: float, numwords: float, blacks: int, hard: bool = False
-    ) -> float:
+        cls, n: np.ndarray, numwords: float, blacks: np.ndarray, hard: bool = False
+    ) -> np.ndarray:
         return n * n / (blacks + 1)
 
 
@@ -112,27 +328,49 @@ class EntropySolver(StatisticalSolver):
     }
 
     @classmethod
-    def turn_per_entropy(cls, entropy: float, blacks: int, hard: bool = False) -> float:
-        return entropy * cls.tpe[hard][blacks]
+    def turn_per_entropy(
+        cls, entropy: np.ndarray, blacks: np.ndarray, hard: bool = False
+    ) -> np.ndarray:
+        return entropy * np.asarray(cls.tpe[hard])[blacks]
 
     @classmethod
     def score_formula(
-        cls, n: float, numwords: float, blacks: int, hard: bool = False
-    ) -> float:
-        entropy = n / numwords * math.log(n, 2)
+        cls, n: np.ndarray, numwords: float, blacks: np.ndarray, hard: bool = False
+    ) -> np.ndarray:
+        entropy = n / numwords * np.log2(n)
         return cls.turn_per_entropy(entropy, blacks, hard=hard)
 
     @classmethod
-    def post_process_score(cls, s: float) -> float:
+    def post_process_score(cls, s: np.ndarray) -> np.ndarray:
         return s + 1
 
 
 class BlackEntropySolver(EntropySolver):
     @classmethod
     def score_formula(
-        cls, n: float, numwords: float, blacks: int, hard: bool = False
-    ) -> float:
-        return n / numwords * math.log(n, 2) / (blacks + 1)
+        cls, n: np.ndarray, numwords: float, blacks: np.ndarray, hard: bool = False
+    ) -> np.ndarray:
+        return n / numwords * np.log2(n) / (blacks + 1)
+
+
+_worker: StatisticalSolver | None = None
+
+
+def _init_worker(
+    solvertype: Type[StatisticalSolver], wordlist: list[tuple[str, int]]
+) -> None:
+    global _worker
+    _worker = solvertype(WordleList(wordlist))
+
+
+def _compute_shard(
+    keys: np.ndarray, wordles: list[Wordle], n: int, hard: bool
+) -> list[tuple[float, Wordle]]:
+    assert _worker is not None
+    _worker._load_keys(keys)
+    if 0 < n < len(wordles):
+        return _worker.compute_top(wordles, n, hard=hard)
+    return _worker.compute(wordles, hard=hard)
 
 
 solversdict: dict[str, Type[core.WordleSolver]] = {
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
 import string
-from functools import cache
-from typing import Iterable, NamedTuple
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import repeat
+from typing import TYPE_CHECKING, NamedTuple, SupportsIndex, overload
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from wordle.constraints import ClueIndex
+    from wordle.patterns import PatternMatrix
+
+# Words turned into Python strings at a time when iterating a WordleList.
+BLOCK = 4096
 
 
 class Wordle(str):
@@ -15,14 +26,25 @@ class Wordle(str):
 
 
 class Clue(list):
-    def __init__(self, word: Wordle | str, signal: list[int] = None):
+    """Display view of a clue; `code` is the base-3 integer used internally."""
+
+    def __init__(self, word: Wordle | str, signal: list[int] | int | None = None):
         self.word = Wordle(word)
         if signal is None:
             signal = [0] * len(word)
+        elif isinstance(signal, (int, np.integer)):
+            if not 0 <= signal < 3 ** len(word):
+                raise ValueError("Signal code out of range")
+            signal = decode(int(signal), len(word))
         else:
             if len(signal) != len(word):
                 raise ValueError("Signal length must match word length")
         super().__init__(signal)
+        self.code = encode(self)
+
+    @property
+    def solved(self) -> bool:
+        return self.code == 3 ** len(self) - 1
 
     def same(self, other: Clue) -> bool:
         return self.word == other.word and self == other
@@ -33,8 +55,7 @@ class Clue(list):
         return cls(guess, compare(guess, key))
 
 
-@cache
-def compare(guess: str | Wordle, key: str | Wordle) -> list[int]:
+def compare_uncached(guess: str | Wordle, key: str | Wordle) -> int:
     if not isinstance(guess, Wordle):
         guess = Wordle(guess)
     if not isinstance(key, Wordle):
@@ -63,7 +84,120 @@ def compare(guess: str | Wordle, key: str | Wordle) -> list[int]:
                 signal[i] = 1
                 s -= 1
 
-    return signal
+    return encode(signal)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: int
+
+
+class CompareCache:
+    """compare() behind a least-recently-used cache holding at most maxsize pairs."""
+
+    def __init__(self, maxsize: int = 1 << 16):
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+        self.maxsize = maxsize
+        self.clear()
+
+    def __call__(self, guess: str | Wordle, key: str | Wordle) -> int:
+        pair = (guess, key)
+        try:
+            code = self.data[pair]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.data.move_to_end(pair)
+            return code
+        code = compare_uncached(guess, key)
+        if self.maxsize > 0:
+            self.data[pair] = code
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+                self.evictions += 1
+        return code
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(self.data), self.maxsize
+        )
+
+    def clear(self) -> None:
+        self.data: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+compare = CompareCache()
+
+
+def code_dtype(length: int) -> type[np.unsignedinteger]:
+    if 3**length <= 1 << 8:
+        return np.uint8
+    if 3**length <= 1 << 16:
+        return np.uint16
+    return np.uint32
+
+
+def encode(signal: Iterable[int]) -> int:
+    return sum(s * 3**i for i, s in enumerate(signal))
+
+
+def decode(code: int, length: int) -> list[int]:
+    return [(code // 3**i) % 3 for i in range(length)]
+
+
+def letter_array(words: list[str] | tuple[str, ...]) -> np.ndarray:
+    return np.array([[ord(c) for c in word] for word in words], dtype=np.uint32)
+
+
+def compare_codes(guesses: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Clue codes for every guess against every key, as a (guesses, keys) array."""
+    m, n = guesses.shape
+    k = keys.shape[0]
+    alphabet, dense = np.unique(np.concatenate([guesses, keys]), return_inverse=True)
+    dense = dense.reshape(m + k, n)
+    guesses, keys = dense[:m], dense[m:]
+    counts = np.zeros((len(alphabet), k), dtype=np.uint8)
+    for p in range(n):
+        counts[keys[:, p], np.arange(k)] += 1
+    green = [guesses[:, i, None] == keys[None, :, i] for i in range(n)]
+    codes = np.zeros((m, k), dtype=code_dtype(n))
+    for i in range(n):
+        total = counts[guesses[:, i]]
+        # Letters that occur once in the guess are yellow whenever present.
+        signal = green[i].astype(np.uint8) + (total > 0)
+        same = guesses == guesses[:, i, None]
+        repeated = np.flatnonzero(same.sum(axis=1) > 1)
+        if len(repeated):
+            # Earlier copies and later greens use up the key's copies first.
+            same = same[repeated]
+            used = np.zeros((len(repeated), k), dtype=np.uint8)
+            for j in range(n):
+                if j < i:
+                    used += same[:, j, None]
+                elif j > i:
+                    used += green[j][repeated] & same[:, j, None]
+            signal[repeated] = np.where(green[i][repeated], 2, used < total[repeated])
+        codes += signal.astype(codes.dtype) * codes.dtype.type(3**i)
+    return codes
+
+
+def compare_many(guess: str | Wordle, keys: np.ndarray | Iterable[str]) -> np.ndarray:
+    """Clue codes of one guess against every key, in the order of the keys."""
+    if not isinstance(keys, np.ndarray):
+        keys = letter_array([Wordle(key) for key in keys])
+    if len(keys) == 0:
+        return np.zeros(0, dtype=code_dtype(len(guess)))
+    if len(guess) != keys.shape[1]:
+        raise ValueError("Length mismatch")
+    return compare_codes(letter_array([Wordle(guess)]), keys)[0]
 
 
 class WeightedWordle(NamedTuple):
@@ -71,38 +205,222 @@ class WeightedWordle(NamedTuple):
     weight: int
 
 
-class WordleList(list):
+class Words(Sequence[Wordle]):
+    """Read-only view of fixed-width word arrays, making Wordles on access."""
+
+    def __init__(self, chars: np.ndarray):
+        self.chars = chars
+        self._ids: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    @overload
+    def __getitem__(self, index: SupportsIndex) -> Wordle: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Words: ...
+
+    def __getitem__(self, index: SupportsIndex | slice) -> Wordle | Words:
+        if isinstance(index, slice):
+            return Words(self.chars[index])
+        word = self.chars[index]
+        return str.__new__(Wordle, word.decode() if isinstance(word, bytes) else word)
+
+    def select(self, index: np.ndarray) -> Words:
+        """View of the words picked by a boolean mask or an array of IDs."""
+        return Words(self.chars[index])
+
+    def __iter__(self) -> Iterator[Wordle]:
+        for start in range(0, len(self.chars), BLOCK):
+            yield from _wordles(self.chars[start : start + BLOCK])  # noqa: E203
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and word in self.ids
+
+    @property
+    def ids(self) -> dict[str, int]:
+        """Position of every word, built on first use."""
+        if self._ids is None:
+            words = self.chars.astype(str).tolist()
+            self._ids = dict(zip(words, range(len(words))))
+        return self._ids
+
+
+def _wordles(chars: np.ndarray) -> list[Wordle]:
+    # Builtins in map() skip Wordle's checks and any Python-level frames.
+    return list(map(str.__new__, repeat(Wordle), chars.astype(str).tolist()))
+
+
+class WordleList(Sequence[WeightedWordle]):
+    """Words sorted in reverse and their weights, stored as two arrays.
+
+    chars holds the words as fixed-width bytes, or code points if any word is
+    not ASCII, and letters is the same memory seen as a (words, length) matrix.
+    Wordle and WeightedWordle objects are only made when asked for.
+    """
+
     def __init__(self, wordlelist: list[tuple[str, int]] | list[str]):
         if isinstance(wordlelist[0], str):
-            list_ = [
-                WeightedWordle(Wordle(word), 1) for word in wordlelist  # type: ignore
-            ]
+            list_ = [(Wordle(word), 1) for word in wordlelist]
         else:
-            list_ = [
-                WeightedWordle(Wordle(word[0]), word[1])  # type: ignore
-                for word in wordlelist
-            ]
+            list_ = [(Wordle(word[0]), int(word[1])) for word in wordlelist]
         list_.sort(reverse=True)
-        ziplist = tuple(zip(*list_))
-        self.words: tuple[Wordle, ...] = ziplist[0]
-        self.weights: tuple[int, ...] = ziplist[1]
-        super().__init__(list_)
+        words, weights = zip(*list_)
+        ascii = all(word.isascii() for word in words)
+        self._setup(np.array(words, "S" if ascii else "U"), np.array(weights))
+
+    def _setup(self, chars: np.ndarray, weights: np.ndarray) -> None:
+        self.chars = chars
+        self.words = Words(chars)
+        self.weights: np.ndarray = weights
+        self.compare = CompareCache()
+        self.answers = np.flatnonzero(weights > 0)
+        self._letters: np.ndarray | None = None
+        self._answer_weights: np.ndarray | None = None
+        self._patterns: PatternMatrix | None = None
+        self._index: ClueIndex | None = None
+
+    @classmethod
+    def from_arrays(cls, chars: np.ndarray, weights: np.ndarray) -> WordleList:
+        """Trusted fixed-width byte words, already lowercase, unique and sorted.
+
+        The arrays are used as they are, so they may be memory-mapped.
+        """
+        self = cls.__new__(cls)
+        self._setup(chars, weights)
+        self._letters = _letter_view(chars)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    @overload
+    def __getitem__(self, index: SupportsIndex) -> WeightedWordle: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[WeightedWordle]: ...
+
+    def __getitem__(
+        self, index: SupportsIndex | slice
+    ) -> WeightedWordle | list[WeightedWordle]:
+        if isinstance(index, slice):
+            return list(self)[index]
+        return WeightedWordle(self.words[index], int(self.weights[index]))
+
+    def __iter__(self) -> Iterator[WeightedWordle]:
+        pairs = zip(self.words, self.weights.tolist())
+        return map(tuple.__new__, repeat(WeightedWordle), pairs)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} words)"
+
+    @property
+    def ids(self) -> dict[str, int]:
+        """Word to its dense integer ID, its position in the list."""
+        return self.words.ids
+
+    def lookup(self, words: Iterable[str]) -> np.ndarray:
+        """IDs of words, with -1 for words not in the list."""
+        get = self.ids.get
+        return np.fromiter((get(word, -1) for word in words), dtype=np.intp)
+
+    @property
+    def letters(self) -> np.ndarray:
+        """Letter codes as a (words, length) matrix sharing memory with chars."""
+        if self._letters is None:
+            lengths = np.char.str_len(self.chars)
+            if len(lengths) and lengths.min() != lengths.max():
+                raise ValueError("Length mismatch")
+            self._letters = _letter_view(self.chars)
+        return self._letters
+
+    @property
+    def answer_weights(self) -> np.ndarray:
+        """Weights of the answers as floats, shared by every solver on the list."""
+        if self._answer_weights is None:
+            weights = self.weights[self.answers].astype(np.float64)
+            weights.flags.writeable = False
+            self._answer_weights = weights
+        return self._answer_weights
+
+
+def _letter_view(chars: np.ndarray) -> np.ndarray:
+    dtype = np.uint8 if chars.dtype.kind == "S" else np.uint32
+    return chars.view(dtype).reshape(len(chars), -1)
 
 
 class HardModeFilter:
-    def __init__(self) -> None:
+    """Hard-mode rules from the clues so far: greens stay, found letters are reused.
+
+    Given a wordlist, legal is a mask of the words that follow the rules. It is
+    built on first use and then narrowed clue by clue.
+    """
+
+    def __init__(self, wordlist: WordleList | None = None) -> None:
+        self.wordlist = wordlist
         self.reset()
 
     def reset(self) -> None:
-        self.letters: set[str] = set()
+        self.greens: dict[int, str] = {}
+        self.counts: dict[str, int] = {}
+        self.history: list[tuple[dict[int, str], dict[str, int], np.ndarray | None]]
+        self.history = []
+        self._legal: np.ndarray | None = None
+
+    @property
+    def letters(self) -> set[str]:
+        return set(self.counts)
 
     def add_clue(self, clue: Clue) -> None:
-        for i, letter in enumerate(clue.word):
-            if clue[i] > 0:
-                self.letters.add(letter)
+        self.history.append((self.greens, self.counts, self._legal))
+        greens = {i: c for i, (c, s) in enumerate(zip(clue.word, clue)) if s == 2}
+        found: dict[str, int] = {}
+        for letter, signal in zip(clue.word, clue):
+            if signal > 0:
+                found[letter] = found.get(letter, 0) + 1
+        greens = {i: c for i, c in greens.items() if self.greens.get(i) != c}
+        found = {c: k for c, k in found.items() if k > self.counts.get(c, 0)}
+        self.greens = {**self.greens, **greens}
+        self.counts = {**self.counts, **found}
+        if self._legal is not None:
+            self._legal = self._narrow(self._legal, greens, found)
+
+    def pop_clue(self) -> None:
+        """Undo the last add_clue()."""
+        self.greens, self.counts, self._legal = self.history.pop()
 
     def test(self, word: Wordle) -> set[str]:
-        return self.letters.difference(set(word))
+        """Letters whose green position or revealed count word breaks."""
+        broken = {c for c, k in self.counts.items() if word.count(c) < k}
+        for i, letter in self.greens.items():
+            if i >= len(word) or word[i] != letter:
+                broken.add(letter)
+        return broken
 
     def filter(self, list_: Iterable[Wordle]) -> Iterable[Wordle]:
         return filter(lambda word: not self.test(word), list_)
+
+    @property
+    def legal(self) -> np.ndarray:
+        """Which words of wordlist are legal guesses, as a boolean array."""
+        if self.wordlist is None:
+            raise ValueError("HardModeFilter has no wordlist")
+        if self._legal is None:
+            full = np.ones(len(self.wordlist), dtype=bool)
+            self._legal = self._narrow(full, self.greens, self.counts)
+        return self._legal
+
+    def _narrow(
+        self, legal: np.ndarray, greens: dict[int, str], counts: dict[str, int]
+    ) -> np.ndarray:
+        assert self.wordlist is not None
+        if not greens and not counts:
+            return legal
+        letters = self.wordlist.letters
+        legal = legal.copy()
+        for i, letter in greens.items():
+            legal &= letters[:, i] == ord(letter)
+        for letter, k in counts.items():
+            legal &= (letters == ord(letter)).sum(axis=1, dtype=np.uint8) >= k
+        return legal
@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+from wordle import patterns
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("cache")
+    old = os.environ.get(patterns.CACHE_ENV)
+    os.environ[patterns.CACHE_ENV] = str(path)
+    yield path
+    if old is None:
+        del os.environ[patterns.CACHE_ENV]
+    else:
+        os.environ[patterns.CACHE_ENV] = old
@@ -0,0 +1,78 @@
+import io
+import json
+from contextlib import redirect_stdout
+
+import pytest
+
+from wordle import loaders, solvers
+from wordle.analysis import microbench
+from wordle.analysis.benchmark import (
+    calc_average_score,
+    opening_history,
+    read_log,
+    run_logged,
+)
+from wordle.analysis.entval import calc_datatable
+
+
+@pytest.mark.parametrize("hard", [False, True])
+def test_parallel_benchmark(hard):
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    with redirect_stdout(io.StringIO()):
+        serial = calc_average_score(wl, solvers.StatisticalSolver, hard, "crate")
+        parallel = calc_average_score(
+            wl, solvers.StatisticalSolver, hard, "crate", workers=2
+        )
+    assert serial == parallel
+
+
+def test_opening_history():
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    solver = solvers.StatisticalSolver(wl)
+    history = opening_history(wl, solver, firstguess="crate")
+    assert history[()] == ("crate", 0.0)
+    assert len(history) > 1
+    assert all(len(key) == 1 and key[0][0] == "crate" for key in history if key)
+
+
+def test_microbench():
+    report = microbench.run(["testwl"], budget=0.001)
+    cases = {result["case"] for result in report["results"]}
+    assert {"compare", "StatisticalSolver.best", "HardModeFilter.filter"} <= cases
+    assert all(result["seconds"] > 0 for result in report["results"])
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_resume_log(tmp_path):
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    log = tmp_path / "benchmark.jsonl"
+    with redirect_stdout(io.StringIO()):
+        data, score, fails = calc_average_score(
+            wl, solvers.StatisticalSolver, firstguess="crate"
+        )
+        run_logged(log, wl, solvers.StatisticalSolver, firstguess="crate")
+    lines = log.read_text().splitlines(keepends=True)
+    # Keep a few finished answers and half of the next one, as if interrupted.
+    log.write_text("".join(lines[:5]) + lines[5][: len(lines[5]) // 2])
+    with redirect_stdout(io.StringIO()):
+        assert run_logged(
+            log, wl, solvers.StatisticalSolver, firstguess="crate"
+        ) == pytest.approx((score, fails))
+    entries = list(read_log(log))
+    assert [entry["word"] for entry in entries] == list(data)
+    assert all(entry["tries"] == data[entry["word"]]["tries"] for entry in entries)
+
+    pruner = solvers.PruningWordleList(wl)
+    assert calc_datatable(read_log(log), pruner) == calc_datatable(data, pruner)
+
+
+@pytest.mark.parametrize("end", ["", "\n"])
+def test_resume_old_log(tmp_path, end):
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    log = tmp_path / "benchmark.json"
+    old = json.dumps({"antic": {"tries": 3, "guesses": []}}) + end
+    log.write_text(old)
+    with pytest.raises(ValueError):
+        run_logged(log, wl, solvers.StatisticalSolver, firstguess="crate")
+    assert log.read_text() == old
+    assert [entry["word"] for entry in read_log(log)] == ["antic"]
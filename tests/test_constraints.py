@@ -0,0 +1,35 @@
+import pytest
+
+from wordle import bitset, loaders
+from wordle.constraints import ClueIndex, clue_index
+from wordle.wordle import Clue, compare, letter_array
+
+
+@pytest.mark.parametrize(
+    "guess, signal",
+    [
+        ("raise", [0, 1, 0, 0, 2]),
+        ("plate", [0, 0, 2, 0, 2]),
+        ("eerie", [1, 0, 0, 0, 2]),
+        ("speed", [0, 0, 2, 1, 0]),
+        ("llama", [2, 0, 0, 0, 0]),
+        ("fuzzy", [0, 0, 0, 0, 0]),
+    ],
+)
+def test_match(guess, signal):
+    wl = loaders.load_wordlelist()
+    index = clue_index(wl)
+    clue = Clue(guess, signal)
+    answers = [wl.words[i] for i in wl.answers]
+    expected = [i for i, key in enumerate(answers) if compare(guess, key) == clue.code]
+    assert bitset.to_indices(index.match(clue), index.size).tolist() == expected
+
+
+def test_impossible():
+    index = ClueIndex(letter_array(["geese", "eerie", "speed"]))
+    # Yellows are given left to right, so this clue never happens.
+    assert bitset.count(index.match(Clue("eerie", [0, 1, 0, 0, 0])), 3) == 0
+    assert bitset.count(index.match(Clue("eerie", [1, 1, 0, 0, 0])), 3) == 1
+    assert bitset.count(index.minimum("e", 3), 3) == 2
+    assert bitset.count(index.exact("e", 2), 3) == 1
+    assert bitset.count(index.position("q", 0), 3) == 0
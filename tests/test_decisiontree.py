@@ -0,0 +1,73 @@
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from wordle import core, loaders, solvers
+from wordle.analysis.benchmark import calc_average_score, run_logged
+from wordle.decisiontree import DecisionTree, TreeSolver, compile_tree
+
+
+@pytest.fixture(scope="module")
+def wordlist():
+    return loaders.load_wordlelist(filename="tests/testwl.txt")
+
+
+@pytest.mark.parametrize("hard", [False, True])
+def test_tree_matches_solver(wordlist, hard, tmp_path):
+    tree = compile_tree(wordlist, solvers.StatisticalSolver, hard, "crate")
+    tree.save(tmp_path / "tree.npz")
+    tree = DecisionTree.load(tmp_path / "tree.npz")
+    assert tree.hard == hard
+    assert tree.guess(0) == "crate"
+
+    with redirect_stdout(io.StringIO()):
+        data, _, _ = calc_average_score(
+            wordlist, solvers.StatisticalSolver, hard, tree=tree
+        )
+    assert all(entry["guesses"][-1][2] == 3**5 - 1 for entry in data.values())
+
+    solver = solvers.StatisticalSolver(wordlist)
+    for answer in ["antic", "onion", "heath"]:
+        ps = core.PlaySession(wordlist, "hard" if hard else "easy", answer)
+        solver.reset()
+        expected = [guess for guess, _, _ in data[answer]["guesses"]]
+        guesses = ["crate"]
+        while not (clue := ps.guess(guesses[-1])).solved:
+            solver.add_clue(clue)
+            guesses.append(solver.besth(1)[0][0] if hard else solver.best(1)[0][0])
+        assert guesses == expected
+
+
+@pytest.mark.parametrize(
+    "solvertype, hard, firstguess",
+    [
+        (solvers.BlackSolver, False, "crate"),
+        (solvers.StatisticalSolver, True, "crate"),
+        (solvers.StatisticalSolver, False, "salet"),
+    ],
+)
+def test_tree_mismatch(wordlist, solvertype, hard, firstguess, tmp_path):
+    tree = compile_tree(wordlist, solvers.StatisticalSolver, False, "crate")
+    with pytest.raises(ValueError):
+        calc_average_score(wordlist, solvertype, hard, firstguess, tree=tree)
+    with pytest.raises(ValueError):
+        run_logged(tmp_path / "log.jsonl", wordlist, solvertype, hard, firstguess, tree)
+    assert not (tmp_path / "log.jsonl").exists()
+
+
+def test_tree_solver(wordlist):
+    tree = compile_tree(wordlist, solvers.StatisticalSolver, False, "crate")
+    solver = TreeSolver(wordlist, tree)
+    guess = solver.best(1)[0][0]
+    solver.add_clue(core.Clue.from_compare(guess, "antic"))
+    assert "antic" in solver.list()
+    with pytest.raises(ValueError):
+        solver.besth(1)
+    solver.add_clue(core.Clue("zonal", [0, 0, 0, 0, 0]))
+    with pytest.raises(ValueError):
+        solver.best(1)
+    solver.pop_clue()
+    assert solver.best(1)[0][0] == tree.guess(solver.node)
+    with pytest.raises(ValueError):
+        TreeSolver(loaders.load_wordlelist(), tree)
@@ -0,0 +1,78 @@
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from wordle import loaders, solvers
+from wordle.analysis.benchmark import calc_average_score
+from wordle.analysis.entval import (
+    calc_datatable,
+    calc_steps,
+    calc_turns_per_entropy,
+    fit_turns_per_entropy,
+)
+from wordle.analysis.evaltpe import sweep
+from wordle.wordle import decode
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sweep(tmp_path, workers):
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    output = tmp_path / "tpe_easy.csv"
+    with redirect_stdout(io.StringIO()):
+        first = sweep(["crate"], output, workers=workers, wordlist=wl)
+        table = sweep(["crate", "heath"], output, workers=workers, wordlist=wl)
+        data, _, _ = calc_average_score(wl, solvers.EntropySolver, False, "crate")
+    assert [line.split(",")[0] for line in output.read_text().splitlines()] == [
+        "crate",
+        "heath",
+    ]
+    expected = calc_turns_per_entropy(
+        calc_datatable(data, solvers.PruningWordleList(wl))
+    )
+    assert first[0] == pytest.approx(expected)
+    assert table[0] == pytest.approx(expected)
+
+
+def test_sweep_resume(tmp_path):
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    output = tmp_path / "tpe_easy.csv"
+    with redirect_stdout(io.StringIO()):
+        table = sweep(["crate", "heath"], output, wordlist=wl)
+    crate, heath = output.read_text().splitlines(keepends=True)
+    # A short row, and a row cut off mid-write by an interrupted run.
+    output.write_text(crate + "heath,0.27\n" + "onion,0.27,0.4")
+    with redirect_stdout(io.StringIO()):
+        resumed = sweep(["heath", "crate"], output, wordlist=wl)
+    assert resumed == pytest.approx(table[::-1])
+    assert output.read_text() == crate + "heath,0.27\n" + heath
+
+
+def test_fit_turns_per_entropy():
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    with redirect_stdout(io.StringIO()):
+        data, _, _ = calc_average_score(wl, solvers.EntropySolver, True, "heath")
+    pruner = solvers.PruningWordleList(wl)
+    entropy, tries, black = calc_steps(data, pruner)
+    table = calc_datatable(data, pruner)
+    assert len(table[0]) == len(entropy) + (black == 0).sum()
+    assert sorted(table[3]) == sorted(zip(entropy[black == 3], tries[black == 3]))
+    assert fit_turns_per_entropy(entropy, tries, black, 5) == pytest.approx(
+        calc_turns_per_entropy(table)
+    )
+
+
+def test_calc_steps_list_clues():
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    with redirect_stdout(io.StringIO()):
+        data, _, _ = calc_average_score(wl, solvers.EntropySolver, False, "crate")
+    old = {
+        word: {
+            **entry,
+            "guesses": [[g, p, decode(c, 5)] for g, p, c in entry["guesses"]],
+        }
+        for word, entry in data.items()
+    }
+    pruner = solvers.PruningWordleList(wl)
+    for new, legacy in zip(calc_steps(data, pruner), calc_steps(old, pruner)):
+        assert (new == legacy).all()
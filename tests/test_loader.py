@@ -1,4 +1,20 @@
+import bz2
+import gzip
+import lzma
+
+import numpy as np
+import pytest
+
+from wordle import loaders
+from wordle.loaders import (
+    dedup,
+    filter_length,
+    load_compiled,
+    load_file,
+    load_resource,
+)
 from wordle.loaders import load_wordlelist as load
+from wordle.wordle import WordleList
 
 
 def test_default():
@@ -22,3 +38,82 @@ def test_file_1():
 def test_filt_2():
     wl = load(length=5, filename="tests/testwl.txt")
     assert len(wl) == 1099
+
+
+@pytest.mark.parametrize("length", [4, 5, 7])
+def test_compiled_matches_text(length):
+    source = "official" if length == 5 else "custom"
+    wordlist = WordleList(filter_length(dedup(load_resource(source)), length))
+    compiled = load_compiled(source, length)
+    assert compiled is not None
+    assert list(compiled) == list(wordlist)
+    assert np.array_equal(compiled.answers, wordlist.answers)
+    assert np.array_equal(compiled.letters, wordlist.letters)
+
+
+def test_compiled_keyed_by_source(monkeypatch, tmp_path):
+    monkeypatch.setenv("WORDLE_CACHE_DIR", str(tmp_path))
+    assert load_compiled("custom", 4) is not None
+    (first,) = (tmp_path / "wordlists").iterdir()
+    assert load_compiled("custom", 4) is not None
+    assert list((tmp_path / "wordlists").iterdir()) == [first]
+    monkeypatch.setattr(loaders, "resource_hash", lambda source: "changed")
+    assert len(load_compiled("custom", 4)) == 5461
+    assert len(list((tmp_path / "wordlists").iterdir())) == 2
+
+
+def test_compiled_unwritable_cache(monkeypatch, tmp_path):
+    (tmp_path / "file").touch()
+    monkeypatch.setenv("WORDLE_CACHE_DIR", str(tmp_path / "file"))
+    monkeypatch.setattr(loaders, "SHARDS", {})
+    calls = []
+    load = loaders.load_resource
+
+    def load_resource(source):
+        calls.append(source)
+        return load(source)
+
+    monkeypatch.setattr(loaders, "load_resource", load_resource)
+    assert len(loaders.load_wordlelist(6)) == len(loaders.load_wordlelist(6))
+    assert len(loaders.load_wordlelist(4)) == 5461
+    assert calls == ["custom"]
+
+
+@pytest.mark.parametrize("opener", [gzip.open, bz2.open, lzma.open])
+def test_file_compressed(tmp_path, opener):
+    suffix = {gzip.open: ".gz", bz2.open: ".bz2", lzma.open: ".xz"}[opener]
+    path = tmp_path / f"testwl.txt{suffix}"
+    with opener(path, "wt") as f:
+        f.write(open("tests/testwl.txt").read())
+    assert load_file(path, 5) == load_file("tests/testwl.txt", 5)
+
+
+@pytest.mark.parametrize(
+    "text, format, expected",
+    [
+        ("apple\nberry\napple\nfig\n", None, [("apple", 2), ("berry", 1)]),
+        ("apple 3\nfig 2\napple 4\n", None, [("apple", 7)]),
+        ("3 apple\n2 fig\n1 bérry\n", None, [("apple", 3), ("bérry", 1)]),
+        ("3 apple\n2 fig\n", "weight word", [("apple", 3)]),
+        ("12345\napple\n", "word", [("apple", 1)]),
+    ],
+)
+def test_file_stream(tmp_path, text, format, expected):
+    path = tmp_path / "words.txt"
+    path.write_text(text)
+    assert load_file(path, 5, format) == expected
+
+
+@pytest.mark.parametrize("text, format", [("a,b\n", None), ("", None), ("a\n", "x")])
+def test_file_invalid(tmp_path, text, format):
+    path = tmp_path / "words.txt"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        load_file(path, 5, format)
+
+
+def test_shards_cached():
+    assert load(6) is load(6)
+    assert load(7) is not load(6)
+    with pytest.raises(ValueError):
+        load(30)
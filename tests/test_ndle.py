@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from wordle import loaders
+from wordle.analysis import ndle
+from wordle.patterns import pattern_matrix
+from wordle.wordle import compare
+
+
+def brute_force(wl, words, disjoint):
+    patterns = pattern_matrix(wl)
+    scores = []
+    for i, w1 in enumerate(words):
+        for w2 in words[i + 1 :]:  # noqa: E203
+            if disjoint and set(w1) & set(w2):
+                continue
+            groups: dict[tuple[int, int], int] = {}
+            for ans in (wl.words[k] for k in patterns.answers):
+                key = (compare(w1, ans), compare(w2, ans))
+                groups[key] = groups.get(key, 0) + 1
+            n = np.array(list(groups.values()), dtype=np.float64)
+            scores.append(np.sum(n * np.log2(n)) / n.sum())
+    return sorted(scores)
+
+
+@pytest.mark.parametrize("disjoint, workers", [(True, 1), (False, 1), (True, 2)])
+def test_best_pairs(disjoint, workers, monkeypatch):
+    # Small blocks and seed so that pruning and sharding both kick in.
+    monkeypatch.setattr(ndle, "BLOCK", 4)
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    words = ndle.candidates(wl, 8)
+    assert all(len(set(word)) == 5 for word in words)
+    best = ndle.best_pairs(wl, words, 5, disjoint=disjoint, workers=workers)
+    assert [score for _, _, score in best] == pytest.approx(
+        brute_force(wl, words, disjoint)[:5]
+    )
+
+
+def test_beam_search():
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    words = ndle.candidates(wl, 8)[:20]
+    patterns = pattern_matrix(wl)
+    expected = []
+    for triple in itertools.combinations(words, 3):
+        codes = [patterns.row(word).astype(np.int64) for word in triple]
+        joint = (codes[0] * 243 + codes[1]) * 243 + codes[2]
+        n = np.unique(joint, return_counts=True)[1]
+        total = len(joint)
+        entropy = np.log2(total) - np.sum(n * np.log2(n)) / total
+        expected.append((-entropy, (n * n).sum() / total, set(triple)))
+    expected.sort(key=lambda item: item[0])
+    # A beam holding every pair makes the search exhaustive.
+    sets = ndle.beam_search(wl, 3, beam=190, words=words)
+    assert [-entropy for _, entropy, _ in sets[:10]] == pytest.approx(
+        [item[0] for item in expected[:10]]
+    )
+    assert set(sets[0][0]) == expected[0][2]
+    assert sets[0][2] == pytest.approx(expected[0][1])
+    assert ndle.beam_search(wl, 3, beam=190, words=words, workers=2) == sets
+
+
+def test_candidates():
+    wl = loaders.load_wordlelist()
+    answers = ndle.candidates(wl)
+    guesses = ndle.candidates(wl, guesses=True)
+    assert set(answers) < set(guesses)
+    assert all(wl.weights[wl.ids[word]] > 0 for word in answers)
+    assert len(ndle.candidates(wl, 0)) == 2315
@@ -0,0 +1,31 @@
+import pytest
+
+from wordle import loaders, patterns
+from wordle.wordle import WordleList, compare
+
+
+@pytest.mark.parametrize("length", [4, 7])
+def test_matrix_matches_compare(length):
+    wl = loaders.load_wordlelist(length)
+    wl = WordleList(list(zip(wl.words[::40], wl.weights[::40])))
+    pm = patterns.PatternMatrix(wl, cache=False)
+    assert pm.matrix.shape == (len(wl), len(pm.answers))
+    for i, guess in enumerate(wl.words):
+        for j, key in enumerate(pm.answers):
+            expected = compare(guess, wl.words[key])
+            assert pm.matrix[i, j] == expected
+
+
+def test_cache(cache_dir):
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    pm = patterns.PatternMatrix(wl)
+    assert pm.path.parent == cache_dir
+    assert pm.path.is_file()
+    cached = patterns.PatternMatrix(wl)
+    assert (cached.matrix == pm.matrix).all()
+    assert patterns.pattern_matrix(wl) is patterns.pattern_matrix(wl)
+
+
+def test_length_mismatch():
+    with pytest.raises(ValueError):
+        patterns.PatternMatrix(WordleList(["word", "wordle"]), cache=False)
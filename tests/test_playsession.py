@@ -32,6 +32,7 @@ def test_playsession_hard():
     with pytest.raises(HardModeInvalid) as e:
         ps.guess("bread")
     assert e.value.args[1] == {"h"}
+    assert e.value.args[0].endswith("reused: h")
 
     with pytest.raises(ValueError):
         ps.new("fails")
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from wordle import loaders
+from wordle.loaders import load_wordlelist as load
+from wordle.repl import REPLoop
+
+
+def run(loop, line):
+    loop.tokens = line.split(" ")
+    loop.eval()
+    return loop.msg
+
+
+@pytest.mark.parametrize("length", [3, 6, 15])
+def test_length(length):
+    loop = REPLoop(length=5, autorun=False)
+    assert run(loop, f"length {length}").startswith(f"Length set to {length}.")
+    run(loop, "list")
+    assert loop.wordlist is load(length)
+    assert len(loop.solve_session.list()) == len(load(length).answers)
+    assert "Kept the previous word list" in run(loop, "length 30") + run(loop, "new")
+    assert loop.length == length and loop.wordlist is load(length)
+
+
+def test_warming(monkeypatch):
+    release = threading.Event()
+    original = loaders.load_wordlelist
+
+    def slow(*args, **kwargs):
+        release.wait(10)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(loaders, "load_wordlelist", slow)
+    loop = REPLoop(length=5, autorun=False)
+    assert loop.warming
+    assert run(loop, "compare crane react") == "🟨🟨🟩⬛🟨"
+    assert run(loop, "difficulty hard") == "Difficulty set to hard."
+    assert run(loop, "help").strip().startswith("This program")
+    assert loop.warming
+    release.set()
+    run(loop, "play")
+    assert not loop.warming
+    assert loop.play_session.mode == "hard"
+
+
+def test_bad_wordfile(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("a,b\n")
+    loop = REPLoop(length=5, autorun=False)
+    wordlist = loop.wordlist
+    assert run(loop, f"wordfile {path}").startswith("Reading words")
+    assert run(loop, "best 1") == "Invalid file format. Kept the previous word list."
+    assert loop.wordfile is None and loop.wordlist is wordlist
+
+
+def test_bad_gzip_wordfile(tmp_path):
+    path = tmp_path / "words.txt.gz"
+    path.write_bytes(b"crate\n")
+    loop = REPLoop(length=5, autorun=False)
+    wordlist = loop.wordlist
+    run(loop, f"wordfile {path}")
+    assert run(loop, "list").endswith("Kept the previous word list.")
+    assert loop.wordfile is None and loop.wordlist is wordlist
+
+
+@pytest.mark.parametrize("first", ["length 30", "wordfile README.md"])
+def test_bad_reload_first(first):
+    loop = REPLoop(length=5, autorun=False)
+    run(loop, first)
+    assert run(loop, "list").endswith("Kept the previous word list.")
+    assert loop.length == 5 and loop.wordfile is None
+    assert loop.wordlist is load(5)
+    assert run(loop, "best 1").startswith("roate")
+
+
+@pytest.mark.parametrize("line", ["guess raise whale", "guess raise 0 1 0 0 2"])
+def test_guess_signal(line):
+    loop = REPLoop(length=5, autorun=False)
+    assert run(loop, line) is None
+    assert loop.solve_session.clues[0] == [0, 1, 0, 0, 2]
@@ -0,0 +1,155 @@
+import asyncio
+import json
+
+import pytest
+
+from wordle import loaders
+from wordle.server import WordleServer, response
+
+
+async def request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    while (await reader.readline()).strip():
+        pass
+    data = json.loads(await reader.read())
+    writer.close()
+    return status, data
+
+
+def run(scenario, **kwargs):
+    async def main():
+        server = WordleServer(loaders.load_wordlelist(), **kwargs)
+        _, port = await server.start()
+        try:
+            return await scenario(server, port)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_solve_session():
+    async def scenario(server, port):
+        status, created = await request(port, "POST", "/sessions", {})
+        assert status == 201 and created["candidates"] == 2315
+        path = f"/sessions/{created['id']}"
+        status, data = await request(port, "GET", path + "/best?n=2")
+        assert status == 200 and [b["word"] for b in data["best"]] == ["roate", "raise"]
+        clue = {"word": "raise", "clue": "01002"}
+        status, data = await request(port, "POST", path + "/guess", clue)
+        assert data["candidates"] == 41 and not data["solved"]
+        _, data = await request(port, "GET", path + "/list?n=3")
+        assert data["count"] == 41 and len(data["words"]) == 3
+        _, data = await request(port, "POST", path + "/undo")
+        assert data["candidates"] == 2315 and data["clues"] == []
+        status, _ = await request(port, "DELETE", path)
+        assert status == 200
+        status, _ = await request(port, "GET", path)
+        assert status == 404
+
+    run(scenario)
+
+
+def test_play_session():
+    async def scenario(server, port):
+        new = {"mode": "play", "difficulty": "hard", "answer": "white"}
+        _, created = await request(port, "POST", "/sessions", new)
+        path = f"/sessions/{created['id']}"
+        _, data = await request(port, "POST", path + "/guess", {"word": "ahead"})
+        assert data["clue"] == [0, 2, 1, 0, 0] and data["tries"] == 1
+        status, data = await request(port, "POST", path + "/guess", {"word": "bread"})
+        assert status == 400 and "hard mode" in data["error"]
+        status, data = await request(port, "GET", path + "/best")
+        assert status == 400
+        status, data = await request(port, "POST", path + "/undo")
+        assert status == 400
+        _, data = await request(port, "GET", path)
+        assert data["tries"] == 1 and len(data["clues"]) == 1
+        _, data = await request(port, "GET", path + "/answer")
+        assert data == {"answer": "white"}
+
+    run(scenario)
+
+
+@pytest.mark.parametrize(
+    "method, path, payload, status",
+    [
+        ("GET", "/nowhere", None, 404),
+        ("GET", "/sessions", None, 405),
+        ("POST", "/sessions", {"mode": "watch"}, 400),
+        ("POST", "/sessions", {"mode": "play", "answer": "zzzzz"}, 400),
+        ("GET", "/sessions/unknown/best", None, 404),
+    ],
+)
+def test_errors(method, path, payload, status):
+    async def scenario(server, port):
+        return await request(port, method, path, payload)
+
+    assert run(scenario)[0] == status
+
+
+def test_concurrent_sessions_and_eviction():
+    async def scenario(server, port):
+        created = await asyncio.gather(
+            *(request(port, "POST", "/sessions", {}) for _ in range(50))
+        )
+        ids = {data["id"] for _, data in created}
+        assert len(ids) == 50
+        clue = {"word": "raise", "clue": [0, 1, 0, 0, 2]}
+        results = await asyncio.gather(
+            *(request(port, "POST", f"/sessions/{i}/guess", clue) for i in ids),
+            request(port, "GET", "/health"),
+        )
+        assert all(data["candidates"] == 41 for _, data in results[:-1])
+        assert results[-1][1] == {"sessions": 50, "words": 12972}
+        solvers = {id(server.sessions[i].solver.masterlist) for i in ids}
+        assert solvers == {id(server.wordlist)}
+        weights = {id(server.sessions[i].solver.answer_weights) for i in ids}
+        assert weights == {id(server.wordlist.answer_weights)}
+        first = next(iter(ids))
+        server.sessions[first].used -= 120
+        assert server.evict() == 1
+        assert len(server.sessions) == 49 and first not in server.sessions
+
+    run(scenario, idle=60)
+
+
+def test_queued_deletes():
+    async def scenario(server, port):
+        _, created = await request(port, "POST", "/sessions", {})
+        path = f"/sessions/{created['id']}"
+        session = server.sessions[created["id"]]
+        async with session.lock:
+            tasks = [asyncio.create_task(request(port, "DELETE", path)) for _ in "ab"]
+            await asyncio.sleep(0.1)
+        results = await asyncio.gather(*tasks)
+        assert [status for status, _ in results] == [200, 200]
+        assert not server.sessions
+
+    run(scenario)
+
+
+def test_internal_error(monkeypatch):
+    async def scenario(server, port):
+        _, created = await request(port, "POST", "/sessions", {})
+
+        async def act(*args):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(server, "act", act)
+        return await request(port, "GET", f"/sessions/{created['id']}")
+
+    assert run(scenario) == (500, {"error": "Internal server error"})
+
+
+def test_response():
+    head, body = response(200, {"a": 1}, keep=False).split(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK") and b"Connection: close" in head
+    assert json.loads(body) == {"a": 1}
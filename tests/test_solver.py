@@ -3,6 +3,7 @@ from typing import Type
 import pytest
 
 from wordle import core, loaders, solvers
+from wordle.wordle import compare, decode
 
 
 @pytest.mark.parametrize(
@@ -112,3 +113,77 @@ def test_solver_list(solver: Type[core.WordleSolver]):
         "amaze",
         "adage",
     }
+
+
+def test_solver_parallel():
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    serial = solvers.EntropySolver(wl)
+    parallel = solvers.EntropySolver(wl, workers=2, chunksize=100)
+    try:
+        assert parallel.best(10) == serial.best(10)
+        for s in (serial, parallel):
+            s.add_clue(core.Clue("raise", [0, 1, 0, 0, 2]))
+        assert parallel.besth(10) == serial.besth(10)
+        assert parallel.best(0) == serial.best(0)
+    finally:
+        parallel.close()
+
+
+@pytest.mark.parametrize("solver", set(solvers.solversdict.values()))
+def test_solver_scores(solver):
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    s = solver(wl)
+    s.add_clue(core.Clue("raise", [0, 0, 0, 0, 1]))
+    numwords = len(s.list())
+    for word in ("plate", "fuzzy", "lento", s.list()[0]):
+        boxes: dict[int, int] = {}
+        for key in s.list():
+            code = compare(word, key)
+            boxes[code] = boxes.get(code, 0) + 1
+        expected = sum(
+            s.score_formula(n, numwords, decode(code, 5).count(0))
+            for code, n in boxes.items()
+        )
+        expected = s.post_process_score(expected)
+        if word in s.list():
+            expected *= (numwords - 1) / numwords
+        assert s.score(word) == pytest.approx(expected)
+        assert s.scores([word])[0] == s.score(word)
+
+
+@pytest.mark.parametrize("solver", set(solvers.solversdict.values()))
+def test_solver_top(solver):
+    wl = loaders.load_wordlelist(filename="tests/testwl.txt")
+    s = solver(wl)
+    words = [word.word for word in wl]
+    for clue in ([], [0, 0, 0, 0, 0], [0, 1, 0, 0, 2]):
+        if clue:
+            s.add_clue(core.Clue("raise", clue))
+        for hard in (False, True):
+            assert s.compute_top(words, 7, hard=hard) == s.compute(words, hard)[:7]
+            bounds = s.score_bounds(words, hard=hard)
+            assert (bounds <= s.scores(words, hard=hard)).all()
+
+
+def test_solver_rewind():
+    wl = loaders.load_wordlelist()
+    s = solvers.PruningWordleList(wl)
+    full = s.list()
+
+    s.add_clue(core.Clue("raise", [0, 1, 0, 0, 2]))
+    after_raise = s.list()
+    s.add_clue(core.Clue("plate", [0, 0, 2, 0, 2]))
+    assert len(s.list()) == 9
+    assert s.hmf.test("weave") == set()
+
+    assert s.pop_clue() == core.Clue("plate", [0, 0, 2, 0, 2])
+    assert s.list() == after_raise
+    assert s.hmf.test("sagol") == {"e"}
+
+    s.add_clue(core.Clue("plate", [0, 0, 2, 0, 2]))
+    assert [clue.word for clue in s.rewind(2)] == ["raise", "plate"]
+    assert s.list() == full
+    assert s.hmf.test("sagol") == set()
+
+    with pytest.raises(IndexError):
+        s.pop_clue()
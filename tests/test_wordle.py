@@ -1,6 +1,7 @@
 import pytest
 
 import wordle.wordle as wordle
+from wordle import loaders
 
 
 @pytest.mark.parametrize(
@@ -20,7 +21,26 @@ def test_compare(word, key, expected):
         with pytest.raises(expected):
             wordle.compare(word, key)
     else:
-        assert wordle.compare(word, key) == expected
+        assert wordle.compare(word, key) == wordle.encode(expected)
+
+
+@pytest.mark.parametrize(
+    "word, keys",
+    [
+        ("mopey", ["favor", "mopey", "poppy"]),
+        ("abear", ["abbey", "bread", "erase"]),
+        ("eerie", ["abide", "elder", "eerie", "geese"]),
+        ("llama", ["label", "hello", "small", "llama"]),
+    ],
+)
+def test_compare_many(word, keys):
+    codes = wordle.compare_many(word, keys)
+    assert codes.tolist() == [wordle.compare(word, key) for key in keys]
+
+
+def test_compare_many_mismatch():
+    with pytest.raises(ValueError):
+        wordle.compare_many("wordle", ["words"])
 
 
 def test_hardmodefilter():
@@ -35,7 +55,7 @@ def test_hardmodefilter():
     assert filt.test("agape") == set()
     assert filt.test("apart") == {"e"}
     assert filt.test("spite") == {"a"}
-    assert filt.test("sagol") == {"e", "p"}
+    assert filt.test("sagol") == {"a", "e", "p"}
 
     filt.reset()
 
@@ -43,4 +63,109 @@ def test_hardmodefilter():
 
     filt.add_clue(wordle.Clue("balls", [0, 0, 1, 2, 0]))
 
-    assert filt.test("bails") == set()
+    assert filt.test("bails") == {"l"}
+    assert filt.test("halls") == set()
+
+
+def test_clue_code():
+    clue = wordle.Clue("abdeb", [2, 2, 0, 2, 1])
+    assert clue.code == wordle.compare("abdeb", "abbey")
+    assert wordle.Clue("abdeb", clue.code) == clue
+    assert not clue.solved
+    assert wordle.Clue.from_compare("abbey", "abbey").solved
+
+    with pytest.raises(ValueError):
+        wordle.Clue("abdeb", 3**5)
+
+
+def test_compare_long():
+    word = "counterrevolutionaries"[:15]
+    code = wordle.compare(word, word)
+    assert code == 3**15 - 1
+    assert wordle.compare_many(word, [word]).dtype == "uint32"
+
+
+def test_compare_cache():
+    compare = wordle.CompareCache(maxsize=2)
+    assert compare("mopey", "favor") == wordle.encode([0, 1, 0, 0, 0])
+    compare("sagol", "tiger")
+    compare("mopey", "favor")
+    compare("fleet", "tiger")
+    assert compare.info() == wordle.CacheInfo(
+        hits=1, misses=3, evictions=1, currsize=2, maxsize=2
+    )
+    assert ("sagol", "tiger") not in compare.data
+
+    with pytest.raises(ValueError):
+        compare("wordle", "word")
+    assert compare.info().currsize == 2
+
+    compare.clear()
+    assert compare.info() == wordle.CacheInfo(0, 0, 0, 0, 2)
+
+
+def test_wordlelist_compare_scope():
+    wl = wordle.WordleList(["mopey", "favor"])
+    wl.compare("mopey", "favor")
+    assert wl.compare.info().currsize == 1
+    assert wordle.WordleList(["mopey", "favor"]).compare.info().currsize == 0
+
+
+@pytest.mark.parametrize(
+    "words, kind",
+    [
+        ([("Mopey", 1), ("favor", 0), ("tiger", 2), ("abbey", 1)], "S"),
+        ([("crème", 1), ("favor", 0), ("tiger", 2), ("abbey", 1)], "U"),
+    ],
+)
+def test_wordlelist_compact(words, kind):
+    wl = wordle.WordleList(words)
+    expected = sorted([(w.lower(), n) for w, n in words], reverse=True)
+    assert list(wl) == expected
+    assert wl.chars.dtype.kind == kind
+    assert len(wl) == len(wl.words) == 4
+    assert wl[0] == expected[0] and wl[-1] == expected[-1]
+    assert isinstance(wl[1].word, wordle.Wordle) and type(wl[1].weight) is int
+    assert wl[1:3] == expected[1:3]
+    assert list(wl.words[::2]) == [w for w, _ in expected[::2]]
+    assert expected[3][0] in wl.words and "Abbey" not in wl.words
+    assert "ü" not in wl.words and 42 not in wl.words
+    assert list(wl.answers) == [i for i, (_, n) in enumerate(expected) if n > 0]
+    assert wl.letters.base is not None
+    assert [ord(c) for c in expected[2][0]] == wl.letters[2].tolist()
+
+
+def test_wordlelist_mixed_lengths():
+    wl = wordle.WordleList(["word", "wordle"])
+    assert list(wl.words) == ["wordle", "word"]
+    with pytest.raises(ValueError):
+        wl.letters
+
+
+def test_wordlelist_ids():
+    wl = wordle.WordleList([("mopey", 1), ("favor", 0), ("tiger", 2)])
+    assert wl.ids == {"tiger": 0, "mopey": 1, "favor": 2}
+    assert all(wl.words[i] == word for word, i in wl.ids.items())
+    assert wl.lookup(["favor", "abbey", wordle.Wordle("tiger")]).tolist() == [2, -1, 0]
+    assert wl.lookup([]).tolist() == []
+
+
+def test_hardmodefilter_legal():
+    wl = loaders.load_wordlelist()
+    filt = wordle.HardModeFilter(wl)
+    clues = [
+        wordle.Clue("raise", [0, 1, 0, 0, 2]),
+        wordle.Clue("plain", [1, 0, 2, 0, 0]),
+        wordle.Clue("eerie", [1, 0, 0, 0, 2]),
+    ]
+    masks = [filt.legal]
+    for clue in clues:
+        filt.add_clue(clue)
+        masks.append(filt.legal)
+        expected = [not filt.test(word) for word in wl.words]
+        assert filt.legal.tolist() == expected
+        assert list(wl.words.select(filt.legal)) == list(filt.filter(wl.words))
+    for mask in masks[-2::-1]:
+        filt.pop_clue()
+        assert (filt.legal == mask).all()
+    assert filt.legal.all()